@@ -0,0 +1 @@
+"""Shared building blocks for the 8th Side RSS feed generators."""
@@ -0,0 +1,5 @@
+import sys
+
+from eighthside.cli import main
+
+sys.exit(main())
@@ -0,0 +1,498 @@
+"""Declarative site adapters and the extraction plans compiled from them.
+
+A ``SiteAdapter`` describes one event page: where it is (a URL template
+and its parameters), what to wait for, which elements are events, where
+each field may be found (tried in order), how the start date is put
+together and parsed, the default filter rules, which fields make up the
+GUID and how an item is described. The built-in adapters live in their
+source modules; others are loaded from JSON with ``load_adapter``, so
+another store or game is a data file rather than a new script.
+
+``compile_adapter`` turns an adapter into an ``ExtractionPlan`` once per
+run. Every regex is compiled up front, and every distinct CSS selector is
+compiled once and shared by all the fields that use it. The plan runs over
+parsed HTML (``read``) or inside the page (``to_javascript``). Given an
+``order`` (see selectorstats.py) it tries each field's sources in that
+order, which skips past the ones that never matched on earlier runs, and
+counts hits and misses per source in ``usage`` for the next one.
+
+A field's sources are strings, tried in order until one yields a value:
+
+    ``.css selector``     text of the first matching element
+    ``@attribute``        an attribute of the container itself
+    ``line:N``            the Nth non-blank line of the container text
+    ``link``              href of the container's link
+    ``link:REGEX``        the first group of REGEX in that href
+    ``re:REGEX``          the first text node in the container matching REGEX
+"""
+import hashlib
+import json
+import re
+import string
+from dataclasses import dataclass, field as dataclass_field
+from datetime import datetime, timedelta
+from urllib.parse import quote, urljoin
+
+import soupsieve
+
+from eighthside.rules import FIELDS as RULE_FIELDS, parse_rules
+
+UNDATED = ('skip', 'now')
+
+# Key of the page's wait condition among the fields in ``ExtractionPlan.usage``
+WAIT_FOR = '(wait_for)'
+
+
+def _parse_source(source):
+    """Split a field source string into ``(kind, argument)``."""
+    if source.startswith('@'):
+        return 'attr', source[1:]
+    if source.startswith('line:'):
+        return 'line', int(source[5:])
+    if source == 'link':
+        return 'link', None
+    if source.startswith('link:'):
+        return 'link', source[5:]
+    if source.startswith('re:'):
+        return 're', source[3:]
+    return 'css', source
+
+
+@dataclass(frozen=True)
+class Field:
+    """One event field and the places it may be found, in order."""
+    name: str
+    sources: tuple = ()
+    label: str = None      # Name in the item summary; unlabelled fields are left out
+    default: str = None    # Used when no source matches (or the value is blank)
+    required: bool = False
+    listed: bool = False   # Shown in the default description's list
+    clean: str = None      # Regex removed from the value
+
+    def __post_init__(self):
+        for source in self.sources:
+            try:
+                _parse_source(source)
+            except ValueError:
+                raise ValueError(f"Field {self.name!r}: bad source {source!r}") from None
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """Regex whose named groups fill fields that are still missing.
+
+    It searches another field's value, or with ``source='text'`` the
+    whole container text.
+    """
+    regex: str
+    source: str = 'text'
+
+
+@dataclass(frozen=True)
+class SiteAdapter:
+    """Everything needed to turn one event page into feed items."""
+    name: str
+    label: str
+    url: str
+    container: str
+    fields: tuple
+    feed_title: str = "Event Feed"
+    feed_description: str = "Feed of events"
+    params: dict = dataclass_field(default_factory=dict)
+    wait_for: tuple = ()
+    wait_timeout: float = 10
+    patterns: tuple = ()
+    date: str = '{date}'           # Template over the fields (and ``year``) giving the text to parse
+    date_formats: tuple = ()
+    roll_year: bool = False        # January-March seen in October-December means next year
+    shift_hours: float = 0
+    when_format: str = None        # strftime for the displayed date; default: the date text
+    undated: str = 'skip'          # 'now' keeps events without a usable date, dated today
+    rules: tuple = ()
+    guid: tuple = ('title', 'when')
+    guid_key: str = None           # Field that alone makes the GUID when it has a value (an event ID)
+    link: str = '{url}'
+    description: str = None        # Templates over the fields, ``when`` and ``url``
+    content: str = None
+
+    def __post_init__(self):
+        if self.undated not in UNDATED:
+            raise ValueError(f"Adapter {self.name!r}: unknown undated mode {self.undated!r}")
+        names = {field.name for field in self.fields} | {'when', 'url'}
+        for name in self.guid:
+            if name not in names:
+                raise ValueError(f"Adapter {self.name!r}: GUID field {name!r} is not a field")
+        if self.guid_key is not None and self.guid_key not in names:
+            raise ValueError(f"Adapter {self.name!r}: GUID key {self.guid_key!r} is not a field")
+
+
+class ExtractionPlan:
+    """Compiled form of a ``SiteAdapter``.
+
+    ``order(field, candidates)`` returns a field's sources (or the wait
+    selectors, under ``WAIT_FOR``) in the order to try them; by default
+    the adapter's own order is kept.
+    """
+
+    def __init__(self, adapter, order=None):
+        self.adapter = adapter
+        order = order or (lambda field, candidates: list(candidates))
+        self.url = adapter.url.format(**{key: quote(str(value), safe=',')
+                                         for key, value in adapter.params.items()})
+        self.feed_info = {
+            'title': adapter.feed_title,
+            'link': self.url,
+            'description': adapter.feed_description,
+        }
+
+        # Each distinct selector is compiled once and shared by every field that uses it
+        self.selectors = {}
+        self.container = self._css(adapter.container)
+        self.wait_for = tuple(order(WAIT_FOR, list(dict.fromkeys(adapter.wait_for))))
+        for selector in self.wait_for:
+            self._css(selector)
+
+        # Hits and misses per field and source during this run
+        self.usage = {WAIT_FOR: {selector: [0, 0] for selector in self.wait_for}}
+        self.fields = []
+        for field in adapter.fields:
+            sources = [(source, *self._compile_source(field.name, source))
+                       for source in order(field.name, field.sources)]
+            clean = self._regex(field.name, field.clean) if field.clean else None
+            self.fields.append((field, sources, clean))
+            self.usage[field.name] = {source: [0, 0] for source, _, _ in sources}
+        self.patterns = [(pattern.source, self._regex('pattern', pattern.regex)) for pattern in adapter.patterns]
+        self.needs_text = any(source == 'text' for source, _ in self.patterns)
+
+        self.labels = {field.name: field.label for field in adapter.fields if field.label}
+        self.listed = [field.name for field in adapter.fields if field.listed]
+        self.defaults = {field.name: field.default for field in adapter.fields if field.default is not None}
+        self.required = [field.name for field in adapter.fields if field.required]
+        self.date_fields = [name for _, name, _, _ in string.Formatter().parse(adapter.date) if name]
+
+    def _regex(self, name, source):
+        try:
+            return re.compile(source, re.IGNORECASE)
+        except re.error as e:
+            raise ValueError(f"Adapter {self.adapter.name!r}, {name}: invalid pattern {source!r}: {e}") from e
+
+    def _css(self, selector):
+        compiled = self.selectors.get(selector)
+        if compiled is None:
+            try:
+                compiled = self.selectors[selector] = soupsieve.compile(selector)
+            except soupsieve.SelectorSyntaxError as e:
+                raise ValueError(f"Adapter {self.adapter.name!r}: invalid selector {selector!r}: {e}") from e
+        return compiled
+
+    def _compile_source(self, name, source):
+        kind, argument = _parse_source(source)
+        if kind == 'css':
+            return kind, self._css(argument)
+        if kind == 're' or (kind == 'link' and argument):
+            return kind, self._regex(name, argument)
+        return kind, argument
+
+    def containers(self, soup):
+        """Return the event containers in a parsed document."""
+        return self.container.select(soup)
+
+    def probe_wait(self, soup):
+        """Return the first wait selector present in a parsed document, counting the probes."""
+        usage = self.usage[WAIT_FOR]
+        for selector in self.wait_for:
+            if self._css(selector).select_one(soup) is not None:
+                usage[selector][0] += 1
+                return selector
+            usage[selector][1] += 1
+        return None
+
+    def read(self, container, names=None, record=None):
+        """Return the raw fields found in a parsed (BeautifulSoup) container.
+
+        Only the fields in ``names`` are read when it is given, and they are
+        added to ``record``, so a record can be read in more than one pass.
+        """
+        record = {} if record is None else record
+        lines = None
+        for field, sources, _ in self.fields:
+            if names is not None and field.name not in names:
+                continue
+            usage = self.usage[field.name]
+            for source, kind, argument in sources:
+                if kind == 'css':
+                    element = argument.select_one(container)
+                    value = element.get_text().strip() if element is not None else None
+                elif kind == 'attr':
+                    value = container.get(argument)
+                    if isinstance(value, list):
+                        value = ' '.join(value)
+                elif kind == 'line':
+                    if lines is None:
+                        lines = [line.strip() for line in container.get_text('\n').split('\n') if line.strip()]
+                    value = lines[argument] if argument < len(lines) else None
+                elif kind == 'link':
+                    value = self._link(container, argument)
+                else:
+                    found = container.find(string=argument)
+                    value = found.strip() if found is not None else None
+                if value is None:
+                    usage[source][1] += 1
+                    continue
+                usage[source][0] += 1
+                record[field.name] = value
+                break
+        return record
+
+    def _link(self, container, pattern):
+        if container.name == 'a' and container.has_attr('href'):
+            anchor = container
+        else:
+            anchor = container.find_parent('a', href=True) or container.find('a', href=True)
+        if anchor is None:
+            return None
+        href = urljoin(self.url, anchor['href'])
+        if pattern is None:
+            return href
+        match = pattern.search(href)
+        if match is None:
+            return None
+        return match.group(1) if pattern.groups else match.group(0)
+
+    def complete(self, record, text=''):
+        """Clean the raw fields, apply the patterns and defaults.
+
+        Returns None when a required field is missing.
+        """
+        for field, _, clean in self.fields:
+            if clean is not None and field.name in record:
+                record[field.name] = clean.sub('', record[field.name]).strip()
+        for source, pattern in self.patterns:
+            if all(name in record for name in pattern.groupindex):
+                continue
+            match = pattern.search(text if source == 'text' else record.get(source, ''))
+            if match:
+                record.update((name, value) for name, value in match.groupdict().items() if value is not None)
+        for name, default in self.defaults.items():
+            if not record.get(name):
+                record[name] = default
+        if any(name not in record for name in self.required):
+            return None
+        return record
+
+    def filter_fields(self, record, text=''):
+        """Return the fields the filter rules look at."""
+        fields = {name: record[name] for name in RULE_FIELDS if name != 'text' and name in record}
+        if text:
+            fields['text'] = text
+        return fields
+
+    def _date_text(self, record, now):
+        try:
+            return self.adapter.date.format_map({'year': now.year, **record})
+        except KeyError:
+            return None
+
+    def _strptime(self, text):
+        for date_format in self.adapter.date_formats:
+            try:
+                return datetime.strptime(text, date_format)
+            except ValueError:
+                continue
+        return None
+
+    def parse_start(self, record, now):
+        """Return ``(start, dated)`` for a record, or None if it has no usable date.
+
+        A date that does not parse is tried again with the defaults of the
+        date parts that have one (a default time, say). With
+        ``undated='now'`` an event without a usable date starts now and
+        ``dated`` is False.
+        """
+        text = self._date_text(record, now)
+        start = self._strptime(text) if text is not None else None
+        if start is None and text is not None:
+            fallback = {name: self.defaults[name] for name in self.date_fields
+                        if name in self.defaults and record.get(name) != self.defaults[name]}
+            if fallback:
+                start = self._strptime(self._date_text({**record, **fallback}, now))
+                if start is not None:
+                    record.update(fallback)
+        if start is None:
+            if self.adapter.undated == 'now':
+                return datetime.now(), False
+            return None
+        if self.adapter.roll_year and 'year' not in record and now.month >= 10 and start.month <= 3:
+            start = start.replace(year=now.year + 1)
+        return start, True
+
+    def localize(self, record, start, dated=True):
+        """Return ``(start, when)``: the start in local time and its display text."""
+        if not dated:
+            # Undated events show the text their date was read from
+            when = self._date_text(record, start)
+            if when is None:
+                when = ' '.join(record[source] for source, _ in self.patterns
+                                if source != 'text' and record.get(source))
+            return start, when
+        start += timedelta(hours=self.adapter.shift_hours)
+        if self.adapter.when_format:
+            return start, start.strftime(self.adapter.when_format)
+        return start, self._date_text(record, start)
+
+    def render(self, record, when):
+        """Return the item fields (title, link, description, content, guid) of a dated record."""
+        context = {'url': self.url, **record, 'when': when}
+        if self.adapter.guid_key and context.get(self.adapter.guid_key):
+            guid_source = str(context[self.adapter.guid_key])
+        else:
+            guid_source = '-'.join(str(context.get(name, '')) for name in self.adapter.guid)
+        if self.adapter.description:
+            description = self.adapter.description.format_map(context)
+        else:
+            description = self._default_description(context)
+        if self.adapter.content:
+            content = self.adapter.content.format_map(context)
+        else:
+            content = str({label: record[name] for name, label in self.labels.items() if name in record})
+        return {
+            'title': context.get('title', ''),
+            'link': self.adapter.link.format_map(context),
+            'description': description,
+            'content': content,
+            'guid': hashlib.md5(guid_source.encode()).hexdigest(),
+        }
+
+    def _default_description(self, context):
+        description = "<p></p>"  # Empty paragraph for spacing
+        description += f"<p><h2>{context.get('title', '')}</h2></p>"
+        description += f"<p><strong>Date and Time:</strong> {context['when']}</p>"
+        description += "<p><ul>"
+        for name in self.listed:
+            if name in context:
+                description += f"<li><strong>{self.labels.get(name, name)}</strong>: {context[name]}</li>"
+        description += "</ul></p>"
+        return description
+
+    def to_javascript(self, accepts):
+        """Return a JS function that extracts the page's events in the browser.
+
+        ``accepts`` is a JS filter expression such as
+        ``RuleMatcher.to_javascript()``. The function returns
+        ``{events, hits, usage}``, where each event is ``{record, text}``
+        holding the raw fields of an accepted container (as ``read`` finds
+        them), so only matches cross over. ``complete`` finishes the records
+        in Python, and ``merge_usage`` takes the source hit counts.
+        """
+        spec = {
+            'container': self.adapter.container,
+            'needsText': self.needs_text,
+            'ruleFields': [name for name in RULE_FIELDS if name != 'text'],
+            'fields': [{'name': field.name,
+                        'sources': [[source, *_parse_source(source)] for source, _, _ in sources]}
+                       for field, sources, _ in self.fields],
+        }
+        return '''() => {
+            const accepts = %s;
+            const spec = %s;
+            const toRegExp = (source) => new RegExp(source.replace(/\\(\\?P</g, '(?<'), 'i');
+            const fields = spec.fields.map(f => ({
+                name: f.name,
+                sources: f.sources.map(([source, kind, arg]) =>
+                    [source, kind, (kind === 're' || (kind === 'link' && arg)) ? toRegExp(arg) : arg]),
+            }));
+            const usage = {};
+            for (const f of fields) {
+                usage[f.name] = {};
+                for (const [source] of f.sources) usage[f.name][source] = [0, 0];
+            }
+            const read = (el, kind, arg, lines) => {
+                if (kind === 'css') {
+                    const found = el.querySelector(arg);
+                    return found ? (found.innerText || found.textContent).trim() : null;
+                }
+                if (kind === 'attr') return el.getAttribute(arg);
+                if (kind === 'line') return arg < lines().length ? lines()[arg] : null;
+                if (kind === 'link') {
+                    const anchor = el.closest('a[href]') || el.querySelector('a[href]');
+                    if (!anchor) return null;
+                    if (!arg) return anchor.href;
+                    const m = anchor.href.match(arg);
+                    return m ? (m[1] !== undefined ? m[1] : m[0]) : null;
+                }
+                const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+                for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+                    if (arg.test(node.data)) return node.data.trim();
+                }
+                return null;
+            };
+            const hits = {};
+            const events = [];
+            for (const el of document.querySelectorAll(spec.container)) {
+                const text = el.innerText || el.textContent;
+                let split = null;
+                const lines = () => split || (split = text.split('\\n').map(l => l.trim()).filter(l => l !== ''));
+                const record = {};
+                for (const f of fields) {
+                    for (const [source, kind, arg] of f.sources) {
+                        const value = read(el, kind, arg, lines);
+                        if (value === null || value === undefined) { usage[f.name][source][1]++; continue; }
+                        usage[f.name][source][0]++;
+                        record[f.name] = value;
+                        break;
+                    }
+                }
+                const ruleFields = {text: text};
+                for (const name of spec.ruleFields) {
+                    if (record[name] !== undefined) ruleFields[name] = record[name];
+                }
+                if (accepts(ruleFields, hits)) events.push({record: record, text: spec.needsText ? text : ''});
+            }
+            return {events: events, hits: hits, usage: usage};
+        }''' % (accepts, json.dumps(spec))
+
+    def merge_usage(self, usage):
+        """Fold source hit counts reported by the in-page extractor."""
+        for field, counts in usage.items():
+            for source, (hits, misses) in counts.items():
+                total = self.usage.setdefault(field, {}).setdefault(source, [0, 0])
+                total[0] += int(hits)
+                total[1] += int(misses)
+
+
+def adapter_from_dict(data):
+    """Build a ``SiteAdapter`` from its JSON form (see ``load_adapter``).
+
+    Raises ValueError for unknown or missing keys and bad values.
+    """
+    try:
+        data = dict(data)
+        data['fields'] = tuple(Field(**{**entry, 'sources': tuple(entry.get('sources', ()))})
+                               for entry in data.get('fields', ()))
+        data['patterns'] = tuple(Pattern(entry) if isinstance(entry, str) else Pattern(**entry)
+                                 for entry in data.get('patterns', ()))
+        data['rules'] = tuple(parse_rules(data.get('rules', ())))
+        for key in ('wait_for', 'date_formats', 'guid'):
+            if key in data:
+                data[key] = tuple(data[key])
+        return SiteAdapter(**data)
+    except (TypeError, AttributeError) as e:
+        # Unknown or missing keys, or a list where an object belongs
+        raise ValueError(str(e)) from None
+
+
+def load_adapter(path):
+    """Load a ``SiteAdapter`` from a JSON file.
+
+    The file holds an object with the ``SiteAdapter`` keys. ``fields`` is a
+    list of objects with the ``Field`` keys, ``patterns`` a list of regexes
+    (or objects with ``regex`` and ``source``), and ``rules`` a list of
+    rules as in a ``--rules`` file.
+    """
+    with open(path, encoding='utf-8') as f:
+        return adapter_from_dict(json.load(f))
+
+
+def compile_adapter(adapter, order=None):
+    """Compile ``adapter`` into an ``ExtractionPlan``."""
+    return ExtractionPlan(adapter, order)
@@ -0,0 +1,178 @@
+"""Merge the per-source event lists into one "everything at 8th Side" feed.
+
+Each generator writes its events next to its feed as JSON lines sorted by
+start time (``write_events``). This module streams those files through a
+k-way merge, drops near-identical events reported by more than one source,
+and stops as soon as the window or count cap is reached, so memory follows
+the size of the output rather than the size of the inputs.
+
+Usage:
+    python -m eighthside.aggregate feed.events.jsonl pokemon/feed.events.jsonl -o all.rss
+"""
+import argparse
+import heapq
+import json
+import logging
+import os
+import re
+import sys
+import unicodedata
+from collections import deque
+from datetime import datetime, timedelta
+
+from eighthside.log import setup_logging
+from eighthside.output import write_feed
+
+logger = logging.getLogger(__name__)
+
+# Words that say where an event is rather than what it is
+KEY_STOPWORDS = {'8th', 'side', 'games', 'the', 'at', 'a', 'an', 'and', 'of'}
+
+
+def write_events(path, events):
+    """Write event records to ``path`` as JSON lines sorted by start time.
+
+    Each record is a dict with at least ``title`` and ``start`` (a datetime);
+    ``link``, ``description``, ``content``, ``guid`` and ``source`` are
+    carried through to the merged feed when present.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        for event in sorted(events, key=lambda e: e['start']):
+            record = dict(event)
+            record['start'] = event['start'].isoformat()
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def read_events(path, source=None):
+    """Yield event records from a JSON lines file written by ``write_events``."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            event['start'] = datetime.fromisoformat(event['start'])
+            if source and not event.get('source'):
+                event['source'] = source
+            yield event
+
+
+def normalize_key(title):
+    """Return a key under which near-identical event titles collide."""
+    title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode()
+    words = re.findall(r'[a-z0-9]+', title.lower())
+    return ' '.join(sorted(set(words) - KEY_STOPWORDS))
+
+
+def merge_events(streams, start=None, end=None, limit=None, tolerance=timedelta(minutes=30)):
+    """Yield events from already-sorted ``streams`` in start-time order.
+
+    Events whose normalized titles match and whose start times are within
+    ``tolerance`` of an event already yielded from another source are
+    dropped as duplicates; one source listing the same event twice (say,
+    two sessions at a store) keeps both.
+    The dedupe index only keeps keys from the last ``tolerance`` of output.
+    Iteration stops at the first event after ``end`` or after ``limit``
+    events have been yielded.
+    """
+    seen = {}
+    recent = deque()
+    count = 0
+    for event in heapq.merge(*streams, key=lambda e: e['start']):
+        when = event['start']
+        if start is not None and when < start:
+            continue
+        if end is not None and when > end:
+            break
+
+        # Forget keys that can no longer match anything later in the stream
+        while recent and when - recent[0][0] > tolerance:
+            old_when, old_key = recent.popleft()
+            if seen.get(old_key, (None,))[0] == old_when:
+                del seen[old_key]
+
+        key = normalize_key(event['title'])
+        previous = seen.get(key)
+        if (previous is not None and when - previous[0] <= tolerance
+                and event.get('source') != previous[1]):
+            continue
+        seen[key] = (when, event.get('source'))
+        recent.append((when, key))
+
+        yield event
+        count += 1
+        if limit is not None and count >= limit:
+            break
+
+
+def add_to_feed(feed, events):
+    """Add merged event records to a feedgenerator feed; return the count."""
+    added = 0
+    for event in events:
+        feed.add_item(
+            title=event['title'],
+            link=event.get('link') or feed.feed['link'],
+            description=event.get('description', ''),
+            content=event.get('content', ''),
+            unique_id=event.get('guid'),
+            pubdate=event['start'],
+            categories=[event['source']] if event.get('source') else None,
+        )
+        added += 1
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Merge per-source event lists into one RSS feed.')
+    parser.add_argument('inputs', nargs='+', help='Event files written by the generators (JSON lines)')
+    parser.add_argument('-o', '--output', default='all.rss', help='Output RSS file (default: all.rss)')
+    parser.add_argument('--days', type=int, default=30, help='Only include events in the next N days (default: 30)')
+    parser.add_argument('--limit', type=int, help='Maximum number of events in the merged feed')
+    parser.add_argument('--page-size', type=int, metavar='N',
+                        help='Write a current feed of the next N events plus one linked page per month, '
+                             'each with a .gz copy (see eighthside/feedpages.py)')
+    parser.add_argument('--base-url', default='', help='URL prefix for the links between feed pages')
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    from feedgenerator import Rss201rev2Feed
+
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    window_end = today + timedelta(days=args.days)
+
+    feed_info = {
+        'title': "8th Side Event Feed",
+        'link': "https://locator.wizards.com/store/14936",
+        'description': "All events at 8th Side Games",
+    }
+    # A source that has never had a good run has no event file yet
+    inputs = [path for path in args.inputs if os.path.exists(path)]
+    for path in args.inputs:
+        if path not in inputs:
+            logger.info("Skipping %s: not written yet", path)
+    streams = [read_events(path, source=path) for path in inputs]
+    events = merge_events(streams, start=today, end=window_end, limit=args.limit)
+
+    if args.page_size:
+        from eighthside.feedpages import write_feed_pages
+        events = list(events)
+        if not events:
+            logger.warning("No events to merge; keeping the last good %s", args.output)
+            return 1
+        counts = write_feed_pages(events, args.output, feed_info, args.page_size, args.base_url, build_date=today)
+        logger.info("Merged %d events from %d sources into %s and monthly pages "
+                    "(%d written, %d unchanged, %d removed)", len(events), len(inputs), args.output,
+                    counts['written'], counts['unchanged'], counts['removed'])
+        return
+
+    feed = Rss201rev2Feed(**feed_info)
+    added = add_to_feed(feed, events)
+    if not added:
+        logger.warning("No events to merge; keeping the last good %s", args.output)
+        return 1
+
+    write_feed(feed, args.output)
+    logger.info("Merged %d events from %d sources into %s", added, len(inputs), args.output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+"""Page fetch backends.
+
+Each backend module provides ``async fetch(run, url, selectors=())``
+returning the page HTML. Backends pull in heavy third-party packages
+(requests, Playwright, Selenium), so they are only imported once a run
+selects one.
+"""
+import importlib
+
+BACKENDS = {
+    'http': 'eighthside.backends.http',
+    'playwright': 'eighthside.backends.playwright',
+    'selenium': 'eighthside.backends.selenium',
+}
+
+
+def get_backend(name):
+    """Import and return the backend module called ``name``."""
+    return importlib.import_module(BACKENDS[name])
@@ -0,0 +1,30 @@
+"""Plain HTTP backend: a single GET with browser-like headers, no JavaScript."""
+import asyncio
+import logging
+
+import requests
+
+from eighthside.resilience import throttle
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+TIMEOUT = 30
+
+logger = logging.getLogger(__name__)
+
+
+def get_text(url, params=None, headers=None):
+    """GET ``url`` and return the body; raises for HTTP errors."""
+    response = requests.get(url, params=params, headers={**HEADERS, **(headers or {})}, timeout=TIMEOUT)
+    response.raise_for_status()
+    logger.debug("GET %s: %d bytes", response.url, len(response.content))
+    return response.text
+
+
+async def fetch(run, url, selectors=(), params=None, headers=None):
+    """Return the body of ``url``, fetched in a worker thread."""
+    await throttle(url)
+    return await asyncio.to_thread(get_text, url, params, headers)
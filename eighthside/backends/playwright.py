@@ -0,0 +1,103 @@
+"""Playwright backend: headless Chromium for JavaScript-rendered pages."""
+import asyncio
+import contextlib
+import logging
+
+from playwright.async_api import async_playwright
+
+from eighthside.resilience import throttle
+
+VIEWPORT = {'width': 1920, 'height': 1080}
+SETTLE_SECONDS = 5
+
+# --low-memory: one small renderer, no GPU process, a capped JS heap, and
+# no images, media or fonts (the extractors only read the DOM text)
+LOW_MEMORY_VIEWPORT = {'width': 800, 'height': 600}
+LOW_MEMORY_ARGS = [
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-features=site-per-process,Translate,BackForwardCache,MediaRouter',
+    '--renderer-process-limit=1',
+    '--js-flags=--max-old-space-size=256',
+]
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+
+logger = logging.getLogger(__name__)
+
+
+def launch_options(low_memory=False):
+    """Keyword arguments for ``chromium.launch``."""
+    if low_memory:
+        return {'headless': True, 'args': LOW_MEMORY_ARGS}
+    return {'headless': True}
+
+
+async def _block_heavy_resources(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+@contextlib.asynccontextmanager
+async def open_page(url, low_memory=False):
+    """Launch Chromium, load ``url`` and yield ``(browser, page)`` once it settles."""
+    async with async_playwright() as p:
+        logger.info("Launching Playwright browser%s...", " (low memory)" if low_memory else "")
+        browser = await p.chromium.launch(**launch_options(low_memory))
+        try:
+            context = await browser.new_context(viewport=LOW_MEMORY_VIEWPORT if low_memory else VIEWPORT)
+            if low_memory:
+                await context.route('**/*', _block_heavy_resources)
+            page = await context.new_page()
+
+            logger.info("Navigating to %s", url)
+            await throttle(url)
+            await page.goto(url, wait_until="domcontentloaded")
+
+            # Wait for the page to settle
+            logger.info("Waiting for page to load completely...")
+            await page.wait_for_load_state('networkidle')
+
+            # Wait a bit more to ensure JavaScript execution completes
+            await asyncio.sleep(SETTLE_SECONDS)
+            yield browser, page
+        finally:
+            await browser.close()
+            logger.info("Playwright browser closed")
+
+
+async def fetch(run, url, selectors=()):
+    """Return the rendered HTML of ``url``.
+
+    ``selectors`` are probed in order (the one that matched last run comes
+    first) in a single evaluation, and the first one present is waited for,
+    so late-rendering containers make it into the HTML. The browser is
+    closed before returning, so parsing never overlaps with it.
+    """
+    async with open_page(url, run.low_memory) as (browser, page):
+        found_selector = None
+        if selectors:
+            try:
+                found_selector = await page.evaluate(
+                    'selectors => selectors.find(s => document.querySelector(s) !== null) || null',
+                    list(selectors))
+            except Exception as e:
+                logger.debug("Error checking selectors %s: %s", selectors, e)
+
+        if found_selector:
+            logger.debug("Using selector: %s", found_selector)
+            # Wait explicitly for this selector
+            try:
+                await page.wait_for_selector(found_selector, timeout=10000)
+            except Exception:
+                logger.debug("Timeout waiting for %s, but continuing anyway", found_selector)
+
+        # A screenshot costs a render, so only take one when the page looks wrong
+        if run.debug or not found_selector:
+            run.recorder.attach('screenshot.png', await page.screenshot())
+
+        return await page.content()
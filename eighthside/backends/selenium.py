@@ -0,0 +1,181 @@
+"""Selenium backend: headless Chrome driven through chromedriver.
+
+The chromedriver binary is resolved once per installed Chrome version and
+kept in ``DRIVER_CACHE_DIR``; later runs start it straight from there
+instead of asking ``chromedriver_autoinstaller`` (which looks up the
+matching driver version online on every call). One Chrome session is
+started on the first fetch and reused for every later page of the run,
+then quit when the process exits.
+
+Chrome runs headless, so no Xvfb display is started. Instead of a fixed
+sleep, the page is polled with a single small ``execute_script`` call that
+reports whether the document is ready and the first of the fetch's
+selectors present; the rendered document is only serialized once, after
+a match or at the deadline.
+
+With ``--low-memory`` Chrome gets a small window and memory-saving flags,
+and the session is quit as soon as the page is fetched instead of staying
+alive while it is parsed.
+"""
+import asyncio
+import atexit
+import glob
+import logging
+import os
+import threading
+import time
+
+import chromedriver_autoinstaller
+from chromedriver_autoinstaller import utils as autoinstaller_utils
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from eighthside.resilience import throttle
+
+CHROME_ARGUMENTS = [
+    "--window-size=1200,1200",
+    "--ignore-certificate-errors",
+    "--headless",
+    "--disable-gpu",
+]
+LOW_MEMORY_ARGUMENTS = [
+    "--window-size=800,600",
+    "--ignore-certificate-errors",
+    "--headless",
+    "--disable-gpu",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--renderer-process-limit=1",
+    "--js-flags=--max-old-space-size=256",
+    "--blink-settings=imagesEnabled=false",
+]
+DRIVER_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                'eighthside', 'chromedriver')
+SETTLE_SECONDS = 5
+WAIT_SECONDS = 15
+POLL_SECONDS = 0.5
+
+# Returns whether the document has loaded and the first selector present (or null)
+PROBE_SCRIPT = """
+const selectors = arguments[0];
+const matched = selectors.find(selector => document.querySelector(selector) !== null) || null;
+return {
+    ready: document.readyState === 'complete',
+    matched: matched,
+};
+"""
+HTML_SCRIPT = "return document.documentElement.outerHTML;"
+
+logger = logging.getLogger(__name__)
+
+_driver = None
+_driver_path = None
+# One session is shared by every fetch, and WebDriver sessions are not thread-safe
+_lock = threading.Lock()
+
+
+def resolve_driver(cache_dir=DRIVER_CACHE_DIR):
+    """Return the path of a chromedriver matching the installed Chrome, downloading it once."""
+    chrome_version = chromedriver_autoinstaller.get_chrome_version()
+    if not chrome_version:
+        raise RuntimeError("Chrome is not installed")
+    version_dir = os.path.join(cache_dir, chrome_version)
+    filename = autoinstaller_utils.get_chromedriver_filename()
+    cached = glob.glob(os.path.join(glob.escape(version_dir), '**', filename), recursive=True)
+    if cached and os.access(cached[0], os.X_OK):
+        logger.debug("Using cached chromedriver %s", cached[0])
+        return cached[0]
+
+    logger.info("Installing chromedriver for Chrome %s into %s", chrome_version, version_dir)
+    os.makedirs(version_dir, exist_ok=True)
+    path = chromedriver_autoinstaller.install(path=version_dir)
+    if not path:
+        raise RuntimeError(f"No chromedriver available for Chrome {chrome_version}")
+    return path
+
+
+def get_driver(low_memory=False):
+    """Return the shared Chrome session, starting it on first use. Call with ``_lock`` held."""
+    global _driver, _driver_path
+    if _driver is not None:
+        return _driver
+    if _driver_path is None:
+        _driver_path = resolve_driver()
+
+    chrome_options = webdriver.ChromeOptions()
+    for argument in LOW_MEMORY_ARGUMENTS if low_memory else CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    logger.info("Starting Chrome%s...", " (low memory)" if low_memory else "")
+    _driver = webdriver.Chrome(service=Service(_driver_path), options=chrome_options)
+    return _driver
+
+
+def quit_driver():
+    """Quit the shared Chrome session, if one was started."""
+    global _driver
+    with _lock:
+        if _driver is not None:
+            try:
+                _driver.quit()
+            finally:
+                _driver = None
+                logger.info("Chrome closed")
+
+
+atexit.register(quit_driver)
+
+
+def get_page_source(url, selectors=(), low_memory=False):
+    """Load ``url`` in the shared Chrome session and return the rendered HTML.
+
+    Polls until one of ``selectors`` is present, up to ``WAIT_SECONDS``;
+    without selectors it waits for the document to finish loading and then
+    ``SETTLE_SECONDS`` for scripts to render. In low-memory mode the
+    session is quit once the HTML is read.
+    """
+    selectors = list(selectors)
+    with _lock:
+        driver = get_driver(low_memory)
+        try:
+            logger.info("Navigating to %s", url)
+            driver.get(url)
+            if not selectors:
+                time.sleep(SETTLE_SECONDS)
+            deadline = time.monotonic() + WAIT_SECONDS
+            while True:
+                probe = driver.execute_script(PROBE_SCRIPT, selectors)
+                if probe['matched']:
+                    logger.info("Found selector %s", probe['matched'])
+                    break
+                if not selectors and probe['ready']:
+                    break
+                if time.monotonic() >= deadline:
+                    logger.warning("None of the selectors appeared within %ds", WAIT_SECONDS)
+                    break
+                time.sleep(POLL_SECONDS)
+            html = driver.execute_script(HTML_SCRIPT)
+        except Exception:
+            # A crashed or hung session would fail every later page too
+            _discard(driver)
+            raise
+        if low_memory:
+            # Free Chrome's memory before the page is parsed
+            _discard(driver)
+        return html
+
+
+def _discard(driver):
+    """Drop ``driver`` as the shared session and quit it, ignoring errors."""
+    global _driver
+    _driver = None
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug("Ignoring error while quitting Chrome: %s", e)
+
+
+async def fetch(run, url, selectors=()):
+    """Return the rendered HTML of ``url``; Selenium runs in a worker thread."""
+    await throttle(url)
+    return await asyncio.to_thread(get_page_source, url, selectors, run.low_memory)
@@ -0,0 +1,147 @@
+"""Command line interface: ``python -m eighthside <command>``.
+
+    wotc        Magic: The Gathering events from the Wizards store locator
+    pokemon     Pokemon events from the Pokemon event locator
+    site        events from any page described by a JSON site adapter
+    aggregate   merge per-source event lists into one feed
+    serve       serve feeds from memory with ETag/304 support
+    snapshots   inspect and prune the raw page archive
+
+Only argparse is imported up front. A command imports its source, backend
+and third-party packages when it runs, so ``--help`` and the offline
+commands never pay for Playwright, Selenium or requests.
+"""
+import argparse
+import importlib
+import sys
+
+# Commands that are whole modules with their own ``main(argv)``
+TOOLS = {
+    'aggregate': 'eighthside.aggregate',
+    'serve': 'eighthside.server',
+    'snapshots': 'eighthside.snapshots',
+}
+
+SOURCES = {
+    'wotc': 'eighthside.sources.wotc',
+    'pokemon': 'eighthside.sources.pokemon',
+    'site': 'eighthside.sources.page',
+}
+
+# Kept in sync with eighthside.snapshots / profiling / selection / resilience / selectorstats,
+# which are not imported here
+DEFAULT_ARCHIVE_DIR = 'snapshots'
+DEFAULT_PROFILE_DIR = 'profile'
+DEFAULT_HISTORY_PATH = 'backend-history.json'
+DEFAULT_CIRCUIT_STATE_PATH = 'circuit-state.json'
+DEFAULT_SELECTOR_STATS_PATH = 'selector-stats.json'
+
+
+def add_run_options(parser, output):
+    """Options shared by every generator command."""
+    parser.add_argument('--debug', action='store_true', help='Enable debug output and always write diagnostics')
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text',
+                        help='Log output format (default: text)')
+    parser.add_argument('--rules', help='JSON file of include/exclude filter rules (default: the adapter\'s own)')
+    parser.add_argument('--days', type=int, default=30, help='Only include events in the next N days (default: 30)')
+    parser.add_argument('-o', '--output', default=output,
+                        help=f'Feed file to write; events go to a .events.jsonl beside it (default: {output or "NAME.rss"})')
+    parser.add_argument('--page-size', type=int, metavar='N',
+                        help='Write a current feed of the next N events plus one linked page per month, '
+                             'each with a .gz copy')
+    parser.add_argument('--base-url', default='', help='URL prefix for the links between feed pages')
+    parser.add_argument('--archive', nargs='?', const=DEFAULT_ARCHIVE_DIR, metavar='DIR',
+                        help=f'Archive each fetched page in a snapshot archive (default dir: {DEFAULT_ARCHIVE_DIR})')
+    parser.add_argument('--replay', metavar='REF',
+                        help="Re-run extraction over an archived snapshot ('latest', a run ID or a hash prefix) "
+                             "without fetching or writing the feed")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE_DIR, metavar='DIR',
+                        help=f'Profile each pipeline stage and write reports to DIR (default: {DEFAULT_PROFILE_DIR})')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Small viewport, memory-saving browser flags and a peak RSS report')
+    parser.add_argument('--memory-limit', type=int, metavar='MB',
+                        help='Abort the run cleanly if it and its browser use more than MB of RAM')
+    parser.add_argument('--backend-history', default=DEFAULT_HISTORY_PATH, metavar='PATH',
+                        help=f'Where per-backend fetch results are kept (default: {DEFAULT_HISTORY_PATH})')
+    parser.add_argument('--circuit-state', default=DEFAULT_CIRCUIT_STATE_PATH, metavar='PATH',
+                        help=f'Where consecutive failed runs per source are counted (default: {DEFAULT_CIRCUIT_STATE_PATH})')
+    parser.add_argument('--selector-stats', default=DEFAULT_SELECTOR_STATS_PATH, metavar='PATH',
+                        help=f'Where the selectors that matched each field are remembered '
+                             f'(default: {DEFAULT_SELECTOR_STATS_PATH})')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m eighthside',
+                                     description='Generate RSS feeds of events at 8th Side Games.')
+    subparsers = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    wotc = subparsers.add_parser('wotc', help='Magic: The Gathering events from the Wizards store locator')
+    add_run_options(wotc, 'feed.rss')
+    wotc.add_argument('--adapter', metavar='FILE',
+                      help='JSON site adapter to use instead of the built-in one (another store, say)')
+    wotc.add_argument('--backend', choices=['auto', 'http', 'playwright', 'selenium'], default='auto',
+                      help='How to fetch the store page; auto tries the cheapest backend with a good '
+                           'recent record first and escalates on failure (default: auto)')
+
+    pokemon = subparsers.add_parser('pokemon', help='Pokemon events from the Pokemon event locator')
+    add_run_options(pokemon, 'pokemon/feed.rss')
+    pokemon.add_argument('--backend', choices=['auto', 'http', 'playwright'], default='auto',
+                         help="http queries the event search API for the store's area and date window, "
+                              "playwright scrolls the search page; auto picks by recent record (default: auto)")
+    pokemon.add_argument('--targeted', action='store_true',
+                         help="Always try the search API first, falling back to the page scan")
+    pokemon.add_argument('--adapter', metavar='FILE',
+                         help='JSON site adapter to use instead of the built-in one (another store, say)')
+
+    site = subparsers.add_parser('site', help='Events from any page described by a JSON site adapter')
+    site.add_argument('adapter', metavar='FILE', help='JSON site adapter (see README)')
+    add_run_options(site, None)
+    site.add_argument('--backend', choices=['auto', 'http', 'playwright', 'selenium'], default='auto',
+                      help='How to fetch the page (default: auto)')
+
+    subparsers.add_parser('aggregate', help='Merge per-source event lists into one feed')
+    subparsers.add_parser('serve', help='Serve feeds from memory with ETag/304 support')
+    subparsers.add_parser('snapshots', help='Inspect and prune the raw page archive')
+    return parser
+
+
+def run_source(parser, args):
+    import asyncio
+
+    from eighthside.pipeline import Run, execute
+
+    from eighthside.adapters import compile_adapter, load_adapter
+    from eighthside.rules import compile_rules, load_rules
+
+    source = importlib.import_module(SOURCES[args.command])
+    try:
+        adapter = load_adapter(args.adapter) if args.adapter else source.ADAPTER
+        # Compiled here as well so a bad selector or regex is reported like a bad file
+        compile_adapter(adapter)
+    except (OSError, ValueError) as e:
+        parser.error(f"bad adapter {args.adapter}: {e}")
+    rules = None
+    if args.rules:
+        try:
+            rules = load_rules(args.rules)
+            compile_rules(rules)
+        except (OSError, ValueError) as e:
+            parser.error(f"bad rules file {args.rules}: {e}")
+    # A site's history, circuit state and snapshots are kept under its adapter's name
+    name = adapter.name if args.command == 'site' else args.command
+    if args.output is None:
+        args.output = f"{adapter.name}.rss"
+    run = Run(args, name, adapter, rules)
+    return asyncio.run(execute(run, source.collect))
+
+
+def main(argv=None):
+    """Run a command; returns the exit status (non-zero if a generator found nothing)."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Tools parse their own options, so hand them everything after the command
+    if argv and argv[0] in TOOLS:
+        sys.argv[0] = f"python -m eighthside {argv[0]}"
+        return importlib.import_module(TOOLS[argv[0]]).main(argv[1:])
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return run_source(parser, args)
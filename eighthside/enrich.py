@@ -0,0 +1,94 @@
+"""Concurrent, cached lookup of per-event detail records.
+
+List pages only carry a summary of each event (date, title); the price and
+the event's own page need a second request per event. ``enrich_events``
+fetches those details through a bounded pool of concurrent requests and
+keeps them in a ``DetailCache`` keyed by event ID, so each detail is only
+fetched again once its cache entry has gone stale.
+"""
+import asyncio
+import logging
+import os
+import time
+
+from eighthside.output import load_json, save_json
+
+DEFAULT_TTL = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class DetailCache:
+    """JSON file cache of event details with a time-to-live per entry."""
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.entries = load_json(path, {}, 'detail cache')
+        self.dirty = False
+
+    def get(self, event_id, now=None):
+        """Return cached details for ``event_id`` or None if missing or stale."""
+        entry = self.entries.get(event_id)
+        if entry is None:
+            return None
+        now = time.time() if now is None else now
+        if now - entry['fetched'] > self.ttl:
+            return None
+        return entry['data']
+
+    def put(self, event_id, data, now=None):
+        self.entries[event_id] = {'fetched': time.time() if now is None else now, 'data': data}
+        self.dirty = True
+
+    def prune(self, keep_ids):
+        """Drop entries for events that are no longer listed."""
+        for event_id in set(self.entries) - set(keep_ids):
+            del self.entries[event_id]
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty and os.path.exists(self.path):
+            return
+        save_json(self.path, self.entries)
+        self.dirty = False
+
+
+async def enrich_events(events, fetch_detail, cache, concurrency=4):
+    """Attach a ``detail`` dict to every event that has an ``id``.
+
+    Events that already carry a ``detail`` (for example from an API record
+    with a price) are left alone. ``fetch_detail`` is an async callable
+    taking an event and returning a dict, or None to only use the cache. At
+    most ``concurrency`` fetches run at once. Fresh cache entries are used
+    as-is; a failed fetch falls back to a stale entry when there is one.
+    Returns a dict of counts (cached, fetched, failed).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {'cached': 0, 'fetched': 0, 'failed': 0}
+
+    async def enrich(event):
+        cached = cache.get(event['id'])
+        if cached is not None:
+            event['detail'] = cached
+            stats['cached'] += 1
+            return
+        if fetch_detail is None:
+            return
+        async with semaphore:
+            try:
+                detail = await fetch_detail(event)
+            except Exception as e:
+                logger.warning("Error fetching details for event %s: %s", event['id'], e)
+                stale = cache.entries.get(event['id'])
+                if stale is not None:
+                    event['detail'] = stale['data']
+                stats['failed'] += 1
+                return
+        cache.put(event['id'], detail)
+        event['detail'] = detail
+        stats['fetched'] += 1
+
+    await asyncio.gather(*(enrich(event) for event in events
+                           if event.get('id') and not event.get('detail')))
+    return stats
@@ -0,0 +1,185 @@
+"""Paged feed output: a small current feed plus one page per month.
+
+Instead of one flat feed of every event in the window, ``write_feed_pages``
+writes the next ``page_size`` events to the feed's own path (``all.rss``)
+and every event, grouped by the month it starts in, to monthly pages next
+to it (``all-2026-11.rss``). The pages link to each other with RFC 5005
+``first``/``previous``/``next``/``last`` links, starting from the current
+feed.
+
+Each page is written with a gzip sibling (``all.rss.gz``) for static hosts
+that serve precompressed files. A page is only rewritten, and its ``.gz``
+recompressed, when its bytes change: items carry their start time as
+``pubDate`` and the build date comes from the items, so an unchanged month
+renders to identical bytes and keeps its file, mtime and ETag.
+
+The monthly pages are also the feed's history. Events that have already
+started are no longer among the ``events`` passed in, so they are read back
+from their month's existing page and kept on it; only events from today on
+are replaced by the new list. A page is removed only when it would be empty.
+"""
+import glob
+import gzip
+import io
+import logging
+import os
+import re
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+
+from feedgenerator import Rss201rev2Feed
+
+from eighthside.aggregate import add_to_feed
+from eighthside.output import replace_file
+
+DEFAULT_PAGE_SIZE = 20
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+
+logger = logging.getLogger(__name__)
+
+
+class PagedRssFeed(Rss201rev2Feed):
+    """RSS 2.0 feed with Atom paging links and a stable build date."""
+
+    def rss_attributes(self):
+        attrs = super().rss_attributes()
+        attrs['xmlns:atom'] = ATOM_NS
+        return attrs
+
+    def add_root_elements(self, handler):
+        super().add_root_elements(handler)
+        for rel, href in self.feed.get('page_links', ()):
+            handler.addQuickElement('atom:link', None,
+                                    {'rel': rel, 'href': href, 'type': 'application/rss+xml'})
+
+    def latest_post_date(self):
+        # feedgenerator falls back to now(), which would change an empty page every run
+        if not self.items:
+            return self.feed['build_date']
+        return super().latest_post_date()
+
+
+def page_path(path, month):
+    """Return the monthly page path for feed ``path`` and a (year, month)."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}-{month[0]:04d}-{month[1]:02d}{ext}"
+
+
+def month_pages(path):
+    """Return ``{(year, month): page path}`` for the monthly pages of ``path`` on disk."""
+    stem, ext = os.path.splitext(path)
+    month_page = re.compile(re.escape(stem) + r'-(\d{4})-(\d{2})' + re.escape(ext) + '$')
+    pages = {}
+    for existing in glob.glob(glob.escape(stem) + '-*' + glob.escape(ext)):
+        match = month_page.match(existing)
+        if match:
+            pages[(int(match.group(1)), int(match.group(2)))] = existing
+    return pages
+
+
+def read_page_events(path):
+    """Return the event records on a page written by ``write_feed_pages``."""
+    try:
+        root = ElementTree.parse(path).getroot()
+    except (OSError, ElementTree.ParseError) as e:
+        logger.warning("Ignoring unreadable feed page %s: %s", path, e)
+        return []
+    events = []
+    for item in root.iter('item'):
+        pubdate = item.findtext('pubDate')
+        if not pubdate:
+            continue
+        event = {
+            'title': item.findtext('title') or '',
+            'link': item.findtext('link') or '',
+            'description': item.findtext('description') or '',
+            'guid': item.findtext('guid'),
+            'start': parsedate_to_datetime(pubdate),
+        }
+        if item.findtext('category'):
+            event['source'] = item.findtext('category')
+        events.append(event)
+    return events
+
+
+def render(feed):
+    """Return the feed document as UTF-8 bytes."""
+    buffer = io.StringIO()
+    feed.write(buffer, 'utf-8')
+    return buffer.getvalue().encode('utf-8')
+
+
+def write_if_changed(path, data):
+    """Write ``path`` and ``path.gz`` unless ``path`` already holds ``data``."""
+    gz_path = path + '.gz'
+    try:
+        with open(path, 'rb') as f:
+            unchanged = f.read() == data
+    except OSError:
+        unchanged = False
+    if unchanged and os.path.exists(gz_path):
+        return False
+    replace_file(path, data)
+    replace_file(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+    return True
+
+
+def write_feed_pages(events, path, feed_info, page_size=DEFAULT_PAGE_SIZE, base_url='', build_date=None):
+    """Write the current feed and monthly pages for ``events``.
+
+    ``events`` are event records as written by ``aggregate.write_events``
+    (``start`` a datetime), from ``build_date`` (default: today) on.
+    ``base_url`` is prefixed to the page file names in the paging links; by
+    default they are relative. Returns a dict of counts: written,
+    unchanged, removed.
+    """
+    events = sorted(events, key=lambda e: e['start'])
+    build_date = build_date or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # Events before build_date are history: keep them from the pages written so far
+    existing = month_pages(path)
+    months = {}
+    for month, existing_path in existing.items():
+        if month <= (build_date.year, build_date.month):
+            past = [event for event in read_page_events(existing_path) if event['start'] < build_date]
+            if past:
+                months[month] = past
+    for event in events:
+        months.setdefault((event['start'].year, event['start'].month), []).append(event)
+
+    pages = [(path, feed_info['title'], events[:page_size])]
+    for month in sorted(months):
+        title = f"{feed_info['title']} ({datetime(*month, 1).strftime('%B %Y')})"
+        pages.append((page_path(path, month), title, months[month]))
+
+    def href(page):
+        return base_url + os.path.basename(page[0])
+
+    counts = {'written': 0, 'unchanged': 0, 'removed': 0}
+    for i, page in enumerate(pages):
+        links = [('self', href(page)), ('first', href(pages[0]))]
+        if i > 0:
+            links.append(('previous', href(pages[i - 1])))
+        if i + 1 < len(pages):
+            links.append(('next', href(pages[i + 1])))
+        links.append(('last', href(pages[-1])))
+
+        feed = PagedRssFeed(**{**feed_info, 'title': page[1]}, page_links=links, build_date=build_date)
+        add_to_feed(feed, sorted(page[2], key=lambda e: e['start']))
+        if write_if_changed(page[0], render(feed)):
+            counts['written'] += 1
+        else:
+            counts['unchanged'] += 1
+
+    # Drop monthly pages (and their .gz) left with neither history nor upcoming events
+    for month, existing_path in existing.items():
+        if month not in months:
+            for stale in (existing_path, existing_path + '.gz'):
+                if os.path.exists(stale):
+                    os.unlink(stale)
+            counts['removed'] += 1
+
+    logger.info("Feed pages for %s: %d written, %d unchanged, %d removed",
+                path, counts['written'], counts['unchanged'], counts['removed'])
+    return counts
@@ -0,0 +1,102 @@
+"""Leveled logging for the generators, with an on-failure flight recorder.
+
+``setup_logging`` sends INFO and above (DEBUG with ``--debug``) to stderr
+as text or JSON lines. Independently, every ``eighthside`` record at DEBUG
+and above (INFO and above from third-party libraries) goes into a
+``FlightRecorder``: a bounded ring buffer that keeps the unformatted
+records plus a few diagnostic artifacts (page HTML, screenshots, class
+inventories). Artifacts may be callables, which are only evaluated if the
+recorder is dumped, so a healthy run pays for neither the formatting nor
+the diagnostics. ``dump`` writes everything under ``debug/`` and is called
+when a run fails or produces no events (or always, with ``--debug``).
+"""
+import json
+import logging
+import os
+import sys
+from collections import deque
+from datetime import datetime
+
+DEFAULT_DUMP_DIR = 'debug'
+TEXT_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class FlightRecorder(logging.Handler):
+    """Ring buffer of recent log records and diagnostic artifacts."""
+
+    def __init__(self, capacity=2000, max_artifacts=20):
+        super().__init__(logging.DEBUG)
+        self.records = deque(maxlen=capacity)
+        self.artifacts = deque(maxlen=max_artifacts)
+
+    def emit(self, record):
+        # Keep the record unformatted; args are only rendered on dump
+        self.records.append(record)
+
+    def attach(self, name, data):
+        """Keep an artifact; ``data`` is str, bytes or a callable returning one."""
+        self.artifacts.append((name, data))
+
+    def dump(self, reason, directory=DEFAULT_DUMP_DIR, source='run'):
+        """Write buffered records and artifacts to a new directory; return its path."""
+        path = os.path.join(directory, f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{source}")
+        os.makedirs(path, exist_ok=True)
+
+        formatter = logging.Formatter(TEXT_FORMAT)
+        with open(os.path.join(path, 'log.txt'), 'w', encoding='utf-8') as f:
+            f.write(f"Dump reason: {reason}\n")
+            for record in self.records:
+                f.write(formatter.format(record) + '\n')
+
+        for name, data in self.artifacts:
+            try:
+                if callable(data):
+                    data = data()
+            except Exception as e:
+                data = f"Could not capture {name}: {e}\n"
+            if data is None:
+                continue
+            mode = 'wb' if isinstance(data, bytes) else 'w'
+            encoding = None if mode == 'wb' else 'utf-8'
+            with open(os.path.join(path, name), mode, encoding=encoding) as f:
+                f.write(data)
+
+        logging.getLogger(__name__).warning("Wrote diagnostics to %s (%s)", path, reason)
+        return path
+
+
+def setup_logging(debug=False, log_format='text'):
+    """Configure the root logger and return the run's ``FlightRecorder``."""
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel(logging.DEBUG if debug else logging.INFO)
+    console.setFormatter(JsonFormatter() if log_format == 'json' else logging.Formatter(TEXT_FORMAT))
+
+    recorder = FlightRecorder()
+    root = logging.getLogger()
+    # Third-party DEBUG chatter (asyncio, urllib3, websockets) would crowd our
+    # own records out of the ring buffer, so only the package logs at DEBUG
+    root.setLevel(logging.INFO)
+    root.handlers[:] = [console, recorder]
+    logging.getLogger('eighthside').setLevel(logging.DEBUG)
+    return recorder
@@ -0,0 +1,125 @@
+"""Peak memory of a run, including the browsers it starts.
+
+``MemoryWatch`` samples the resident set size of this process and of all
+its descendant processes (Chromium, chromedriver) from ``/proc`` a
+few times a second and keeps the peaks. Given a ceiling it cancels the run
+as soon as the total goes over it; ``pipeline.execute`` turns that into a
+``MemoryLimitExceeded`` error, so the browser is closed, diagnostics are
+dumped and no feed is written.
+
+On systems without ``/proc`` only this process's own peak is reported.
+"""
+import logging
+import os
+import sys
+import threading
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SAMPLE_INTERVAL = 0.25
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryLimitExceeded(RuntimeError):
+    pass
+
+
+def _rss_kib(pid):
+    """Return the current RSS of ``pid`` in KiB, or None if it is gone."""
+    try:
+        with open(f'/proc/{pid}/status', encoding='ascii', errors='replace') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return 0
+
+
+def _descendants(pid):
+    """Return the PIDs of every process below ``pid``."""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='ascii', errors='replace') as f:
+                # The command name may contain spaces, so split after its closing paren
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    found = []
+    pending = [pid]
+    while pending:
+        for child in children.get(pending.pop(), ()):
+            found.append(child)
+            pending.append(child)
+    return found
+
+
+class MemoryWatch(threading.Thread):
+    """Samples RSS of this process and its children; optionally enforces a ceiling."""
+
+    def __init__(self, limit_mib=None, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.limit_kib = limit_mib * 1024 if limit_mib else None
+        self.interval = interval
+        self.pid = os.getpid()
+        self.has_proc = os.path.isdir('/proc')
+        self.peak_self = 0
+        self.peak_children = 0
+        self.peak_total = 0
+        self.exceeded = None
+        self._task = None
+        self._stop_event = threading.Event()
+
+    def start(self, task=None):
+        """Start sampling; ``task`` is cancelled if the ceiling is crossed."""
+        self._task = task
+        super().start()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        if not self.has_proc:
+            return
+        own = _rss_kib(self.pid) or 0
+        children = sum(_rss_kib(pid) or 0 for pid in _descendants(self.pid))
+        self.peak_self = max(self.peak_self, own)
+        self.peak_children = max(self.peak_children, children)
+        self.peak_total = max(self.peak_total, own + children)
+        if self.limit_kib and own + children > self.limit_kib and self.exceeded is None:
+            self.exceeded = (f"memory use {(own + children) / 1024:.0f} MiB went over "
+                             f"the {self.limit_kib / 1024:.0f} MiB limit")
+            logger.error("Aborting: %s", self.exceeded)
+            if self._task is not None:
+                self._task.get_loop().call_soon_threadsafe(self._task.cancel)
+
+    def stop(self):
+        self._task = None
+        if self.is_alive():
+            self._stop_event.set()
+            self.join()
+        self.sample()
+        if resource is not None:
+            # Also catches peaks between samples; ru_maxrss is bytes on macOS, KiB elsewhere
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform == 'darwin':
+                max_rss //= 1024
+            self.peak_self = max(self.peak_self, max_rss)
+            self.peak_total = max(self.peak_total, self.peak_self)
+
+    def report(self):
+        """Return a one-line summary of the peaks."""
+        if not self.has_proc:
+            return f"Peak RSS: Python {self.peak_self / 1024:.0f} MiB (browser processes not measured)"
+        limit = f", limit {self.limit_kib / 1024:.0f} MiB" if self.limit_kib else ""
+        return (f"Peak RSS: Python {self.peak_self / 1024:.0f} MiB, browser and other child "
+                f"processes {self.peak_children / 1024:.0f} MiB, total {self.peak_total / 1024:.0f} MiB{limit}")
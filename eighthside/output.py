@@ -0,0 +1,60 @@
+"""Helpers for writing generated feeds and state files to disk."""
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def write_feed(feed, path):
+    """Write a feedgenerator feed to ``path`` atomically.
+
+    The feed is written to a temporary file in the same directory and then
+    renamed over ``path``, so anything reading the file (the feed server,
+    a git commit step) never sees a partly written feed.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            feed.write(f, 'utf-8')
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def replace_file(path, data):
+    """Write ``data`` (bytes) to ``path`` atomically, like ``write_feed``."""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_json(path, default, what):
+    """Return the JSON document in ``path``, or ``default`` if it is missing or unreadable.
+
+    ``what`` names the file in the warning logged when it cannot be read.
+    """
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable %s %s: %s", what, path, e)
+        return default
+
+
+def save_json(path, data):
+    """Write ``data`` to ``path`` as JSON, atomically (see ``replace_file``)."""
+    replace_file(path, json.dumps(data, indent=1, sort_keys=True).encode('utf-8'))
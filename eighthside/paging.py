@@ -0,0 +1,33 @@
+"""Parallel fetching of paginated search results."""
+import asyncio
+
+
+async def fetch_all_pages(fetch_page, concurrency=4, max_pages=50):
+    """Fetch every page of a paginated result set.
+
+    ``fetch_page(number)`` is an async callable returning ``(items,
+    total_pages)`` for 1-based page ``number``; ``total_pages`` may be None
+    when the source does not report it. Page 1 is fetched first to learn the
+    page count, then the remaining pages are fetched concurrently (at most
+    ``concurrency`` at once). Without a page count, pages are fetched in
+    batches of ``concurrency`` until one comes back empty.
+    """
+    items, total_pages = await fetch_page(1)
+    results = {1: items}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(number):
+        async with semaphore:
+            results[number] = (await fetch_page(number))[0]
+
+    if total_pages is not None:
+        await asyncio.gather(*(fetch(n) for n in range(2, min(total_pages, max_pages) + 1)))
+    else:
+        number = 2
+        while items and number <= max_pages:
+            batch = range(number, min(number + concurrency, max_pages + 1))
+            await asyncio.gather(*(fetch(n) for n in batch))
+            number += len(batch)
+            items = all(results[n] for n in batch)
+
+    return [item for number in sorted(results) for item in results[number]]
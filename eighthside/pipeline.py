@@ -0,0 +1,206 @@
+"""Stages shared by every generator run.
+
+A ``Run`` holds what the old scripts kept in module globals (arguments,
+logging and the flight recorder, the profiler, the compiled site adapter
+and filter rules, the feed and the date window), so importing a source module does no work and
+nothing is built until a command actually runs. ``execute`` wraps a
+source's fetch/extract coroutine with the common tail: the diagnostics
+dump, writing the feed and event list, and the profile report.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+
+from eighthside.adapters import compile_adapter
+from eighthside.aggregate import write_events
+from eighthside.log import setup_logging
+from eighthside.memory import MemoryLimitExceeded, MemoryWatch
+from eighthside.output import write_feed
+from eighthside.profiling import make_profiler
+from eighthside.resilience import CircuitBreaker
+from eighthside.rules import compile_rules
+from eighthside.selectorstats import SelectorStats
+from eighthside.snapshots import DEFAULT_ROOT, SnapshotArchive
+
+DEFAULT_DAYS = 30
+KEEP_SNAPSHOT_RUNS = 10
+
+
+def date_window(days=DEFAULT_DAYS, now=None):
+    """Return (start of today, start of today + ``days``)."""
+    today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    return today, today + timedelta(days=days)
+
+
+def events_path_for(feed_path):
+    """Return the event list written next to ``feed_path`` (see aggregate.py)."""
+    return os.path.splitext(feed_path)[0] + '.events.jsonl'
+
+
+class Run:
+    """State shared by the stages of one generator run.
+
+    ``rules`` replaces the adapter's own filter rules (the ``--rules`` file).
+    """
+
+    def __init__(self, args, source, adapter, rules=None):
+        self.args = args
+        self.source = source
+        self.label = adapter.label
+        self.debug = args.debug
+
+        # Diagnostics are buffered in memory and only written if the run fails or finds no events
+        self.recorder = setup_logging(args.debug, args.log_format)
+        self.logger = logging.getLogger(f"eighthside.sources.{source}")
+
+        # Per-stage profiler; a no-op unless --profile is given
+        self.profiler = make_profiler(args.profile)
+
+        # Peak RSS tracking (and the optional ceiling) for small machines
+        self.low_memory = args.low_memory
+        if args.low_memory or args.memory_limit:
+            self.memory = MemoryWatch(args.memory_limit)
+        else:
+            self.memory = None
+
+        # Compile the site adapter and the event filter rules once up front; each
+        # field's selectors are tried in the order that matched on earlier runs
+        self.selector_stats = SelectorStats(args.selector_stats)
+        self.plan = compile_adapter(
+            adapter, lambda field, candidates: self.selector_stats.order(source, field, candidates))
+        self.event_filter = compile_rules(adapter.rules if rules is None else rules)
+
+        from feedgenerator import Rss201rev2Feed
+        self.feed_info = self.plan.feed_info
+        self.feed = Rss201rev2Feed(**self.feed_info)
+
+        # Event records for the merged multi-source feed (see eighthside/aggregate.py)
+        self.event_records = []
+
+        self.today, self.window_end = date_window(args.days)
+        self.logger.info("Filtering events between %s and %s",
+                         self.today.strftime('%Y-%m-%d'), self.window_end.strftime('%Y-%m-%d'))
+
+        # Raw page snapshots, when --archive is given (replays only read them)
+        self.archive = SnapshotArchive(args.archive) if args.archive and not args.replay else None
+
+        # Backend that produced the events, set by selection.escalate
+        self.backend = None
+
+        self.feed_path = args.output
+        self.events_path = events_path_for(args.output)
+
+    def in_window(self, when):
+        return self.today <= when <= self.window_end
+
+    def add_event(self, title, start, link, description, content, guid):
+        """Add one event to the feed and to the event list."""
+        self.feed.add_item(
+            title=title,
+            link=link,
+            description=description,
+            content=content,
+            unique_id=guid
+        )
+        self.event_records.append({
+            'title': title,
+            'start': start,
+            'link': link,
+            'description': description,
+            'content': content,
+            'guid': guid,
+            'source': self.label,
+        })
+
+    def replay_snapshots(self):
+        """Return ``(archive, entries)`` for ``--replay``, or None if nothing matches."""
+        archive = SnapshotArchive(self.args.archive or DEFAULT_ROOT)
+        snapshots = archive.resolve(self.args.replay, source=self.source)
+        if not snapshots:
+            self.logger.error("No archived snapshot matches %r", self.args.replay)
+            return None
+        self.logger.info("Replaying %d snapshot(s) from run %s", len(snapshots), snapshots[-1]['run'])
+        return archive, snapshots
+
+    def finish(self):
+        """Write diagnostics if needed, then the feed and event list (unless replaying).
+
+        Returns False when the run found no events; the last good feed and
+        event list are then left in place rather than replaced by empty ones.
+        """
+        if self.backend:
+            self.logger.info("Got %d events using the %s backend", len(self.event_records), self.backend)
+        if not self.event_records:
+            self.recorder.dump("no events found", source=self.source)
+        elif self.debug:
+            self.recorder.dump("--debug", source=self.source)
+
+        if self.args.replay:
+            self.logger.info("Replay finished; feed files left unchanged")
+            return bool(self.event_records)
+
+        # Remember which selectors matched, for the order on the next run
+        self.selector_stats.record(self.source, self.plan.usage)
+        self.selector_stats.save()
+
+        if self.archive:
+            self.archive.prune(keep_runs=KEEP_SNAPSHOT_RUNS)
+
+        if not self.event_records:
+            self.logger.warning("No events found; keeping the last good %s", self.feed_path)
+            return False
+
+        with self.profiler.stage('write'):
+            if self.args.page_size:
+                from eighthside.feedpages import write_feed_pages
+                write_feed_pages(self.event_records, self.feed_path, self.feed_info,
+                                 self.args.page_size, self.args.base_url, build_date=self.today)
+            else:
+                write_feed(self.feed, self.feed_path)
+            write_events(self.events_path, self.event_records)
+        self.logger.info("Successfully wrote %s", self.feed_path)
+        return True
+
+
+async def execute(run, pipeline):
+    """Run ``pipeline(run)`` and the common tail; return the process exit status.
+
+    Errors are logged and dumped, and both errors and empty runs count
+    against the source's circuit breaker. While the breaker is open the
+    source is skipped entirely.
+    """
+    breaker = None
+    if not run.args.replay:
+        breaker = CircuitBreaker(run.source, run.args.circuit_state)
+        if not breaker.allow():
+            return 0
+
+    if run.memory:
+        run.memory.start(asyncio.current_task())
+    ok = False
+    try:
+        try:
+            await pipeline(run)
+        except asyncio.CancelledError:
+            if run.memory is None or run.memory.exceeded is None:
+                raise
+            raise MemoryLimitExceeded(run.memory.exceeded) from None
+        ok = run.finish()
+    except Exception as e:
+        run.logger.error("Error: %s", e, exc_info=run.debug)
+        run.recorder.dump(f"run failed: {e!r}", source=run.source)
+        if not run.args.replay:
+            run.logger.warning("Keeping the last good %s", run.feed_path)
+    finally:
+        if run.memory:
+            run.memory.stop()
+            run.logger.info("%s", run.memory.report())
+        run.profiler.report()
+
+    if breaker is not None:
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+    return 0 if ok else 1
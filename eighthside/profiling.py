@@ -0,0 +1,167 @@
+"""Per-stage CPU and allocation profiling for the generators' ``--profile`` mode.
+
+Each pipeline stage is wrapped in ``profiler.stage(name)``. With profiling
+on, a stage runs under cProfile, tracemalloc and a stack sampler, and
+leaves behind:
+
+    <dir>/<stage>.pstats      cProfile stats (open with ``python -m pstats``)
+    <dir>/<stage>.collapsed   sampled stacks in collapsed format for
+                              flamegraph.pl, speedscope or inferno
+    <dir>/summary.txt         top functions and allocation sites per stage
+
+With profiling off the generators use ``NULL_PROFILER``, whose ``stage``
+returns a shared no-op context manager, and nothing here is imported
+beyond this module.
+"""
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_PROFILE_DIR = 'profile'
+SAMPLE_INTERVAL = 0.001
+TOP_N = 15
+
+logger = logging.getLogger(__name__)
+
+
+class _NullProfiler:
+    _context = contextlib.nullcontext()
+
+    def stage(self, name):
+        return self._context
+
+    def report(self):
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class _StackSampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval."""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class StageProfiler:
+    """Collects cProfile, tracemalloc and sampled-stack data per stage."""
+
+    def __init__(self, output_dir=DEFAULT_PROFILE_DIR, top_n=TOP_N):
+        import cProfile
+        import pstats
+        import tracemalloc
+        self._cProfile = cProfile
+        self._pstats = pstats
+        self._tracemalloc = tracemalloc
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.results = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        tracemalloc = self._tracemalloc
+        tracemalloc.start()
+        sampler = _StackSampler(threading.get_ident())
+        profile = self._cProfile.Profile()
+        sampler.start()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            sampler.stop()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self._save(name, profile, sampler.stacks, snapshot, peak, elapsed)
+
+    def _save(self, name, profile, stacks, snapshot, peak, elapsed):
+        # A stage that runs again (e.g. a fallback fetch) gets its own files
+        runs = sum(1 for result in self.results if result['stage'].split('-')[0] == name)
+        if runs:
+            name = f"{name}-{runs + 1}"
+        stats_path = os.path.join(self.output_dir, f"{name}.pstats")
+        profile.dump_stats(stats_path)
+
+        collapsed_path = os.path.join(self.output_dir, f"{name}.collapsed")
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        stats = self._pstats.Stats(profile)
+        functions = []
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            functions.append((tottime, cumtime, calls, f"{func} ({os.path.basename(filename)}:{line})"))
+        functions.sort(reverse=True)
+
+        snapshot = snapshot.filter_traces([
+            self._tracemalloc.Filter(False, self._tracemalloc.__file__),
+            self._tracemalloc.Filter(False, __file__),
+            self._tracemalloc.Filter(False, threading.__file__),
+        ])
+        allocations = snapshot.statistics('lineno')[:self.top_n]
+
+        self.results.append({
+            'stage': name,
+            'elapsed': elapsed,
+            'peak': peak,
+            'functions': functions[:self.top_n],
+            'allocations': allocations,
+        })
+        logger.info("Profiled stage '%s': %.2fs, peak traced memory %.0f KiB (wrote %s, %s)",
+                    name, elapsed, peak / 1024, stats_path, collapsed_path)
+
+    def report(self):
+        """Write and print the top-N summary for every profiled stage."""
+        lines = []
+        for result in self.results:
+            lines.append(f"== Stage {result['stage']}: {result['elapsed']:.3f}s, "
+                         f"peak traced memory {result['peak'] / 1024:.0f} KiB")
+            lines.append(f"-- Top {self.top_n} functions by own time")
+            lines.append(f"{'tottime':>9} {'cumtime':>9} {'calls':>8}  function")
+            for tottime, cumtime, calls, label in result['functions']:
+                lines.append(f"{tottime:9.4f} {cumtime:9.4f} {calls:8d}  {label}")
+            lines.append(f"-- Top {self.top_n} allocation sites (live at end of stage)")
+            for stat in result['allocations']:
+                frame = stat.traceback[0]
+                lines.append(f"{stat.size / 1024:9.1f} KiB {stat.count:8d} blocks  "
+                             f"{os.path.relpath(frame.filename)}:{frame.lineno}")
+            lines.append("")
+        summary = '\n'.join(lines)
+        with open(os.path.join(self.output_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+            f.write(summary)
+        logger.info("Profile summary:\n%s", summary)
+
+
+def make_profiler(output_dir):
+    """Return a ``StageProfiler`` writing to ``output_dir``, or the no-op one."""
+    if not output_dir:
+        return NULL_PROFILER
+    return StageProfiler(output_dir)
@@ -0,0 +1,155 @@
+"""Rate limits, retries and circuit breakers for the fetch layer.
+
+- ``throttle(url)`` waits on a token bucket for the URL's host, so pages,
+  API result pages and event detail pages on one domain are spread out no
+  matter how many of them run concurrently.
+- ``with_retries(stage, call)`` retries a failed stage a bounded number of
+  times with full-jitter exponential backoff. Errors that will not go away
+  on their own (a missing package, an HTTP 4xx other than 429) are raised
+  at once.
+- ``CircuitBreaker`` remembers, across runs, how many runs of a source in a
+  row failed or found nothing. After ``threshold`` of them it opens and
+  runs skip the source for a cooldown that doubles each time it reopens,
+  and the last good feed stays published meanwhile.
+"""
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from eighthside.output import load_json, save_json
+
+DEFAULT_STATE_PATH = 'circuit-state.json'
+
+# (requests per second, burst) per host
+DOMAIN_RATES = {
+    'locator.wizards.com': (0.5, 2),
+    'events.pokemon.com': (1.0, 4),
+    'op-core.pokemon.com': (2.0, 4),
+}
+DEFAULT_RATE = (1.0, 2)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int
+    base_delay: float
+    max_delay: float
+
+
+RETRY_POLICIES = {
+    'fetch': RetryPolicy(attempts=2, base_delay=5.0, max_delay=30.0),
+    'api': RetryPolicy(attempts=3, base_delay=1.0, max_delay=10.0),
+    'detail': RetryPolicy(attempts=2, base_delay=1.0, max_delay=10.0),
+}
+
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 30 * 60
+BREAKER_MAX_COOLDOWN = 12 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second on average, up to ``burst`` at once."""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+_buckets = {}
+
+
+async def throttle(url):
+    """Wait until the rate limit for ``url``'s host allows another request."""
+    host = urlsplit(url).hostname or ''
+    bucket = _buckets.get(host)
+    if bucket is None:
+        bucket = _buckets[host] = TokenBucket(*DOMAIN_RATES.get(host, DEFAULT_RATE))
+    await bucket.acquire()
+
+
+def is_retryable(error):
+    if isinstance(error, ImportError):
+        return False
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is not None and 400 <= status < 500 and status != 429:
+        return False
+    return True
+
+
+async def with_retries(stage, call):
+    """Await ``call()``, retrying per ``RETRY_POLICIES[stage]``."""
+    policy = RETRY_POLICIES[stage]
+    for attempt in range(1, policy.attempts + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == policy.attempts or not is_retryable(e):
+                raise
+            # Full jitter: anywhere between no wait and the exponential backoff
+            delay = random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1)))
+            logger.warning("%s attempt %d/%d failed (%s); retrying in %.1fs",
+                           stage, attempt, policy.attempts, e, delay)
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """Per-source run breaker whose state is kept in a JSON file between runs."""
+
+    def __init__(self, source, path=DEFAULT_STATE_PATH, threshold=BREAKER_THRESHOLD,
+                 cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_MAX_COOLDOWN):
+        self.source = source
+        self.path = path
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.states = load_json(path, {}, 'circuit state')
+        self.state = self.states.setdefault(source, {'failures': 0, 'open_until': 0, 'cooldown': cooldown})
+
+    def allow(self, now=None):
+        """Return False while the breaker is open."""
+        now = time.time() if now is None else now
+        if now < self.state['open_until']:
+            logger.warning("Circuit for %s is open until %s after %d failed runs; skipping this run",
+                           self.source, datetime.fromtimestamp(self.state['open_until']).strftime('%Y-%m-%d %H:%M'),
+                           self.state['failures'])
+            return False
+        if self.state['open_until']:
+            logger.info("Circuit for %s is half-open; trying one run", self.source)
+        return True
+
+    def record_success(self):
+        self.state.update(failures=0, open_until=0, cooldown=self.cooldown)
+        self.save()
+
+    def record_failure(self, now=None):
+        now = time.time() if now is None else now
+        self.state['failures'] += 1
+        # A failed half-open trial reopens at once, with a longer cooldown
+        if self.state['open_until'] or self.state['failures'] >= self.threshold:
+            self.state['open_until'] = now + self.state['cooldown']
+            logger.warning("Circuit for %s opened for %d minutes after %d failed runs",
+                           self.source, self.state['cooldown'] // 60, self.state['failures'])
+            self.state['cooldown'] = min(self.state['cooldown'] * 2, self.max_cooldown)
+        self.save()
+
+    def save(self):
+        save_json(self.path, self.states)
@@ -0,0 +1,271 @@
+"""Include/exclude rule engine used to filter scraped events.
+
+Rules are compiled once into one combined regex per field, so matching an
+event costs a single ``search`` per field instead of a loop over every term.
+The same compiled rule set can be exported as JavaScript for filters that run
+inside the page (see ``RuleMatcher.to_javascript``).
+"""
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+FIELDS = ('title', 'store', 'cost', 'text')
+KINDS = ('keyword', 'regex')
+ACTIONS = ('include', 'exclude')
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A single keyword or regex rule scoped to one event field."""
+    name: str
+    pattern: str
+    kind: str = 'keyword'
+    field: str = 'title'
+    action: str = 'exclude'
+
+    def __post_init__(self):
+        if self.kind not in KINDS:
+            raise ValueError(f"Rule {self.name!r}: unknown kind {self.kind!r}")
+        if self.field not in FIELDS:
+            raise ValueError(f"Rule {self.name!r}: unknown field {self.field!r}")
+        if self.action not in ACTIONS:
+            raise ValueError(f"Rule {self.name!r}: unknown action {self.action!r}")
+
+    @property
+    def regex(self):
+        """Return the rule as regex source (keywords are escaped)."""
+        if self.kind == 'keyword':
+            return re.escape(self.pattern)
+        return self.pattern
+
+
+# MTG casual play events are not worth a feed entry
+CASUAL_PLAY_RULES = [
+    Rule('casual play', 'casual play'),
+    Rule('causal play', 'causal play'),
+    Rule('open play', 'open play'),
+    Rule('casual mtg', 'casual mtg'),
+    Rule('play mtg', 'play mtg'),
+]
+
+# The Pokemon locator lists every store nearby; keep only 8th Side cards
+EIGHTH_SIDE_RULES = [
+    Rule('8th side', '8th', field='text', action='include'),
+]
+
+
+def _wraps(regex):
+    """Return True if ``regex`` still compiles inside a group (global flags must come first)."""
+    try:
+        re.compile(f"(?:{regex})")
+    except re.error:
+        return False
+    return True
+
+
+def _javascript_source(regex):
+    """Translate Python-only regex syntax for ``RegExp``."""
+    # JS has no global inline flags; the patterns are case-insensitive anyway
+    regex = re.sub(r'^\(\?[aiLu]+\)', '', regex)
+    return re.sub(r'\(\?P=(\w+)\)', r'\\k<\1>', regex.replace('(?P<', '(?<'))
+
+
+class RuleMatcher:
+    """Compiled form of a list of rules.
+
+    For every field the include rules and the exclude rules are each
+    combined into one pattern. Each rule becomes a named group so the rule
+    that fired can be recovered from ``match.lastgroup`` for hit counting.
+    A regex rule with groups of its own keeps a pattern to itself instead:
+    its group names could clash with another rule's, and its numbered
+    backreferences would point at the wrong group once wrapped. So does one
+    that cannot be wrapped at all, such as one starting with ``(?x)``.
+
+    Exclude rules are checked before include rules, field by field in
+    ``FIELDS`` order; within a field the patterns are tried in rule order,
+    and a combined one credits the rule matching at the earliest position.
+    The JavaScript export runs the same patterns in the same order, so hit
+    counts agree wherever the rules run.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.hits = Counter()
+        self._group_to_rule = {}
+        self._exclude = {}
+        self._include = {}
+        for field in FIELDS:
+            self._exclude[field] = self._compile(field, 'exclude')
+            self._include[field] = self._compile(field, 'include')
+        self._has_includes = any(rule.action == 'include' for rule in self.rules)
+
+    def _compile(self, field, action):
+        """Return ``[(pattern, rule)]`` for one field and action, in rule order.
+
+        ``rule`` is None for a combined pattern, whose rule is found from
+        the group that matched.
+        """
+        patterns = []
+        parts = []
+        for index, rule in enumerate(self.rules):
+            if rule.field != field or rule.action != action:
+                continue
+            try:
+                compiled = re.compile(rule.regex, re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Rule {rule.name!r}: invalid pattern: {e}") from e
+            if compiled.groups or not _wraps(rule.regex):
+                if parts:
+                    patterns.append((re.compile('|'.join(parts), re.IGNORECASE), None))
+                    parts = []
+                patterns.append((compiled, rule))
+                continue
+            group = f"_rule{index}"
+            self._group_to_rule[group] = rule
+            parts.append(f"(?P<{group}>{rule.regex})")
+        if parts:
+            patterns.append((re.compile('|'.join(parts), re.IGNORECASE), None))
+        return patterns
+
+    def uses_field(self, field):
+        """Return True if any rule looks at ``field``."""
+        return any(rule.field == field for rule in self.rules)
+
+    def _field_value(self, fields, field):
+        value = fields.get(field)
+        if value is None and field == 'text':
+            value = ' '.join(str(v) for k, v in fields.items() if k in FIELDS and v)
+        return value or ''
+
+    def _search(self, patterns, fields):
+        """Return the first rule among ``{field: [(pattern, rule)]}`` that matches."""
+        for field, entries in patterns.items():
+            if not entries:
+                continue
+            value = self._field_value(fields, field)
+            for pattern, rule in entries:
+                match = pattern.search(value)
+                if match:
+                    return rule or self._group_to_rule[match.lastgroup]
+        return None
+
+    def check(self, fields):
+        """Return ``(accepted, rule)`` for a dict of event fields.
+
+        ``rule`` is the rule that decided the outcome, or None when the event
+        was accepted without any include rules being configured.
+        """
+        rule = self._search(self._exclude, fields)
+        if rule is not None:
+            self.hits[rule.name] += 1
+            return False, rule
+
+        if not self._has_includes:
+            return True, None
+
+        rule = self._search(self._include, fields)
+        if rule is not None:
+            self.hits[rule.name] += 1
+            return True, rule
+        self.hits['(no include matched)'] += 1
+        return False, None
+
+    def accepts(self, fields):
+        """Return True if the event described by ``fields`` passes the rules."""
+        return self.check(fields)[0]
+
+    def summary(self):
+        """Return a one-line description of per-rule hit counts."""
+        if not self.hits:
+            return "no rule hits"
+        return ", ".join(f"{name}: {count}" for name, count in self.hits.most_common())
+
+    def merge_hits(self, hits):
+        """Fold hit counts reported by the in-page JavaScript matcher."""
+        self.hits.update({name: int(count) for name, count in hits.items()})
+
+    def to_javascript(self):
+        """Return a JS expression evaluating to a function equivalent to ``check``.
+
+        The compiled patterns are exported as they are, so the regexes are
+        built once when the expression is evaluated and are tried in the
+        same order as in Python. The function takes an object of fields and
+        a hits object and returns true if the event is accepted.
+        """
+        def export(patterns):
+            specs = []
+            for field, entries in patterns.items():
+                for pattern, rule in entries:
+                    if rule is not None:
+                        specs.append({'field': field, 'source': _javascript_source(rule.regex), 'rule': rule.name})
+                    else:
+                        groups = {name: self._group_to_rule[name].name for name in pattern.groupindex}
+                        specs.append({'field': field, 'source': _javascript_source(pattern.pattern),
+                                      'groups': groups})
+            return specs
+
+        return '''(() => {
+            const compile = (specs) => specs.map(s => Object.assign(s, {re: new RegExp(s.source, 'i')}));
+            const excludes = compile(%s);
+            const includes = compile(%s);
+            const hasIncludes = %s;
+            const fieldNames = %s;
+            return (fields, hits) => {
+                const value = (f) => {
+                    if (fields[f] !== undefined && fields[f] !== null) return String(fields[f]);
+                    if (f !== 'text') return '';
+                    return fieldNames.filter(n => n !== 'text' && fields[n]).map(n => fields[n]).join(' ');
+                };
+                // Name of the first rule that matches, as RuleMatcher._search
+                const search = (specs) => {
+                    for (const s of specs) {
+                        const m = s.re.exec(value(s.field));
+                        if (!m) continue;
+                        if (s.rule !== undefined) return s.rule;
+                        for (const group in s.groups) {
+                            if (m.groups[group] !== undefined) return s.groups[group];
+                        }
+                    }
+                    return null;
+                };
+                const hit = (name) => { hits[name] = (hits[name] || 0) + 1; };
+                let name = search(excludes);
+                if (name !== null) { hit(name); return false; }
+                if (!hasIncludes) return true;
+                name = search(includes);
+                if (name !== null) { hit(name); return true; }
+                hit('(no include matched)');
+                return false;
+            };
+        })()''' % (json.dumps(export(self._exclude)), json.dumps(export(self._include)),
+                    json.dumps(self._has_includes), json.dumps(list(FIELDS)))
+
+
+def load_rules(path):
+    """Load a list of rules from a JSON file.
+
+    The file holds a list of objects with ``name``, ``pattern`` and optional
+    ``kind``, ``field`` and ``action`` keys, matching the ``Rule`` fields.
+    """
+    with open(path, encoding='utf-8') as f:
+        return parse_rules(json.load(f))
+
+
+def parse_rules(data):
+    """Build rules from their JSON form, a list of objects (see ``load_rules``)."""
+    rules = []
+    try:
+        for i, entry in enumerate(data):
+            entry = dict(entry)
+            entry.setdefault('name', entry.get('pattern', f"rule {i + 1}"))
+            rules.append(Rule(**entry))
+    except TypeError as e:
+        # Unknown or missing keys, or something other than a list of objects
+        raise ValueError(str(e)) from None
+    return rules
+
+
+def compile_rules(rules):
+    """Compile ``rules`` into a ``RuleMatcher``."""
+    return RuleMatcher(rules)
@@ -0,0 +1,135 @@
+"""Pick fetch backends from their recent record.
+
+Every fetch attempt is recorded per source and backend in a small JSON
+history: whether it succeeded, whether the page held any events, how long
+it took and how many bytes came back. ``BackendHistory.order`` puts the
+backends with a good recent record (or none yet) first, cheapest first,
+and the rest after them, best record first. ``escalate`` then tries them
+in that order and stops at the first one that returns events.
+
+A backend with a poor record is moved to the back rather than dropped, and
+once its last attempt is ``REPROBE_AFTER`` old it is treated as untried
+again, so a site change that makes a cheaper backend work is picked up.
+"""
+import logging
+import statistics
+import time
+
+from eighthside.output import load_json, save_json
+
+DEFAULT_HISTORY_PATH = 'backend-history.json'
+
+# Cheapest first: no browser, one browser, a browser plus a driver process
+BACKEND_COSTS = ['http', 'playwright', 'selenium']
+
+WINDOW = 10
+GOOD_RATE = 0.5
+REPROBE_AFTER = 7 * 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class BackendHistory:
+    """Recent fetch attempts per source and backend, kept in a JSON file."""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH, window=WINDOW):
+        self.path = path
+        self.window = window
+        self.attempts = load_json(path, {}, 'backend history')
+
+    def record(self, source, backend, ok, empty=False, latency=0.0, size=0, now=None):
+        attempts = self.attempts.setdefault(source, {}).setdefault(backend, [])
+        attempts.append({
+            'time': time.time() if now is None else now,
+            'ok': ok,
+            'empty': empty,
+            'latency': round(latency, 3),
+            'bytes': size,
+        })
+        del attempts[:-self.window]
+
+    def stats(self, source, backend):
+        """Return a summary of the backend's recent attempts, or None if untried."""
+        attempts = self.attempts.get(source, {}).get(backend)
+        if not attempts:
+            return None
+        ok = [a for a in attempts if a['ok']]
+        useful = [a for a in ok if not a['empty']]
+        return {
+            'attempts': len(attempts),
+            'success_rate': len(useful) / len(attempts),
+            'failure_rate': 1 - len(ok) / len(attempts),
+            'empty_rate': (len(ok) - len(useful)) / len(attempts),
+            'latency': statistics.median(a['latency'] for a in ok) if ok else None,
+            'bytes': int(statistics.mean(a['bytes'] for a in ok)) if ok else 0,
+            'last': attempts[-1]['time'],
+        }
+
+    def is_poor(self, source, backend, now=None):
+        stats = self.stats(source, backend)
+        if stats is None or stats['success_rate'] >= GOOD_RATE:
+            return False
+        now = time.time() if now is None else now
+        return now - stats['last'] < REPROBE_AFTER
+
+    def order(self, source, candidates, now=None):
+        """Return ``candidates`` in the order they should be tried."""
+        candidates = sorted(candidates, key=BACKEND_COSTS.index)
+        good = [name for name in candidates if not self.is_poor(source, name, now)]
+        poor = [name for name in candidates if name not in good]
+        poor.sort(key=lambda name: -self.stats(source, name)['success_rate'])
+        return good + poor
+
+    def describe(self, source, backend):
+        """One-line summary of a backend's record for the run report."""
+        stats = self.stats(source, backend)
+        if stats is None:
+            return f"{backend} (untried)"
+        latency = f"{stats['latency']:.1f}s" if stats['latency'] is not None else "n/a"
+        return (f"{backend} ({'poor' if self.is_poor(source, backend) else 'good'}: "
+                f"{stats['success_rate']:.0%} ok, {stats['empty_rate']:.0%} empty, "
+                f"{stats['failure_rate']:.0%} failed, median {latency}, "
+                f"{stats['bytes'] / 1024:.0f} KiB over {stats['attempts']} attempts)")
+
+    def save(self):
+        save_json(self.path, self.attempts)
+
+
+async def escalate(run, history, order, attempt):
+    """Try ``attempt(backend)`` for each backend in ``order``; return the first useful result.
+
+    ``attempt`` is an async callable returning ``(result, size, empty)``.
+    A backend that raises or comes back empty is recorded as such and the
+    next one is tried. If every backend comes back empty the last empty
+    result is returned; if none succeeded at all the last error is raised.
+    """
+    logger.info("Backend order for %s: %s", run.source,
+                '; '.join(history.describe(run.source, name) for name in order))
+    result = None
+    last_error = None
+    succeeded = False
+    try:
+        for name in order:
+            started = time.perf_counter()
+            try:
+                result, size, empty = await attempt(name)
+            except Exception as e:
+                latency = time.perf_counter() - started
+                history.record(run.source, name, ok=False, latency=latency)
+                logger.warning("Backend %s failed after %.1fs: %s", name, latency, e, exc_info=run.debug)
+                last_error = e
+                continue
+            latency = time.perf_counter() - started
+            history.record(run.source, name, ok=True, empty=empty, latency=latency, size=size)
+            succeeded = True
+            logger.info("Backend %s: %s in %.1fs, %.0f KiB", name,
+                        "no events" if empty else "events found", latency, size / 1024)
+            if not empty:
+                run.backend = name
+                return result
+    finally:
+        history.save()
+    if not succeeded and last_error is not None:
+        raise last_error
+    logger.warning("No backend found any events for %s", run.source)
+    return result
@@ -0,0 +1,86 @@
+"""Remember which field selectors matched, and skip the ones that never do.
+
+Each field of a site adapter lists the places its value may be found, in
+priority order, tried until one matches (see adapters.py). The entries are
+not interchangeable: a loose fallback such as ``h4`` also matches on pages
+where the preferred selector does. So ``SelectorStats`` keeps the adapter's
+order and only moves candidates out of the way: those ranked above the
+last run's winner that have not matched once in ``NEVER_MATCHED_RUNS``
+runs go to the end of the chain. The winner is then reached with one
+lookup, and the skipped candidates are still tried whenever everything
+before them misses, so the full chain is probed once the winner stops
+matching. Every ``REPROBE_EVERY`` runs the chain is tried in the adapter's
+order, so a preferred selector that starts matching again takes over.
+
+``record`` folds in one run's counts, and logs selector drift: a
+different candidate taking over from the last winner, or the winner no
+longer matching anything.
+"""
+import logging
+
+from eighthside.output import load_json, save_json
+
+DEFAULT_STATS_PATH = 'selector-stats.json'
+
+NEVER_MATCHED_RUNS = 3
+REPROBE_EVERY = 10
+
+logger = logging.getLogger(__name__)
+
+
+class SelectorStats:
+    """Per-source, per-field selector match counts, kept in a JSON file."""
+
+    def __init__(self, path=DEFAULT_STATS_PATH):
+        self.path = path
+        self.sources = load_json(path, {}, 'selector stats')
+
+    def order(self, source, field, candidates):
+        """Return ``candidates`` (in priority order) in the order they should be tried."""
+        candidates = list(candidates)
+        entry = self.sources.get(source, {}).get(field)
+        if not entry or entry.get('winner') not in candidates:
+            return candidates
+        if entry.get('runs', 0) % REPROBE_EVERY == REPROBE_EVERY - 1:
+            return candidates
+        counts = entry['selectors']
+
+        def never_matched(candidate):
+            stats = counts.get(candidate)
+            return stats is not None and stats['hits'] == 0 and stats['runs'] >= NEVER_MATCHED_RUNS
+
+        ahead = candidates[:candidates.index(entry['winner'])]
+        skipped = [c for c in ahead if never_matched(c)]
+        return [c for c in candidates if c not in skipped] + skipped
+
+    def record(self, source, usage):
+        """Fold one run's ``{field: {candidate: [hits, misses]}}`` into the stats."""
+        fields = self.sources.setdefault(source, {})
+        for field, counts in usage.items():
+            tried = {candidate: c for candidate, c in counts.items() if c[0] or c[1]}
+            if not tried:
+                continue
+            entry = fields.setdefault(field, {'winner': None, 'selectors': {}})
+            entry['runs'] = entry.get('runs', 0) + 1
+            for candidate, (hits, misses) in tried.items():
+                stats = entry['selectors'].setdefault(candidate, {'hits': 0, 'misses': 0, 'runs': 0})
+                stats['hits'] += hits
+                stats['misses'] += misses
+                stats['runs'] += 1
+
+            previous = entry['winner']
+            matched = [candidate for candidate, c in tried.items() if c[0]]
+            if not matched:
+                if previous in tried:
+                    logger.warning("Selector drift: %s %s: %r and every fallback matched nothing in %d lookups",
+                                   source, field, previous, tried[previous][1])
+                continue
+            winner = max(matched, key=lambda candidate: tried[candidate][0])
+            if previous is not None and winner != previous:
+                hits, misses = tried.get(previous, (0, 0))
+                logger.warning("Selector drift: %s %s: %r matched %d of %d lookups, %r took over with %d",
+                               source, field, previous, hits, hits + misses, winner, tried[winner][0])
+            entry['winner'] = winner
+
+    def save(self):
+        save_json(self.path, self.sources)
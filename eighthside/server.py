@@ -0,0 +1,261 @@
+"""Small asyncio HTTP server that serves the generated feeds from memory.
+
+Feeds are held as bytes together with a gzip-compressed copy, an ETag and a
+Last-Modified time, so a request is answered without touching the disk and
+conditional requests from polling readers get a 304. The files on disk are
+watched, and a new version is swapped in as soon as a scrape rewrites one.
+
+Usage:
+    python -m eighthside.server feed.rss pokemon/feed.rss all.rss --port 8080
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+from email.utils import formatdate, parsedate_to_datetime
+
+from eighthside.log import setup_logging
+
+CONTENT_TYPES = {
+    '.rss': 'application/rss+xml; charset=utf-8',
+    '.xml': 'application/xml; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.jsonl': 'application/jsonl; charset=utf-8',
+}
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+logger = logging.getLogger(__name__)
+
+
+class FeedBody:
+    """An immutable served version of one feed."""
+
+    def __init__(self, data, content_type, mtime):
+        self.data = data
+        self.gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+        self.content_type = content_type
+        digest = hashlib.sha1(data).hexdigest()[:16]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gz"'
+        self.mtime = int(mtime)
+        self.last_modified = formatdate(self.mtime, usegmt=True)
+
+
+class FeedStore:
+    """Maps URL paths to the current ``FeedBody`` of each feed.
+
+    ``publish`` replaces a whole entry at once, so readers always see either
+    the old or the new version of a feed, never a mix.
+    """
+
+    def __init__(self):
+        self._feeds = {}
+        self._sources = {}
+        self._stamps = {}
+
+    def publish(self, path, data, mtime=None, content_type=None):
+        """Swap in new bytes for ``path``; return True if the content changed."""
+        if content_type is None:
+            content_type = CONTENT_TYPES.get(os.path.splitext(path)[1], 'application/octet-stream')
+        current = self._feeds.get(path)
+        if current is not None and current.data == data:
+            return False
+        if mtime is None:
+            mtime = os.path.getmtime(self._sources[path]) if path in self._sources else 0
+        self._feeds[path] = FeedBody(data, content_type, mtime)
+        return True
+
+    def get(self, path):
+        return self._feeds.get(path)
+
+    def watch(self, file_path, url_path=None):
+        """Serve ``file_path`` (at ``url_path``) and reload it when it changes."""
+        if url_path is None:
+            url_path = '/' + os.path.relpath(file_path).replace(os.sep, '/')
+        self._sources[url_path] = file_path
+        self.reload(url_path)
+        return url_path
+
+    def reload(self, url_path):
+        file_path = self._sources[url_path]
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return False
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._stamps.get(url_path) == stamp:
+            return False
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        # Keep serving the previous version rather than an empty feed
+        if not data:
+            return False
+        self._stamps[url_path] = stamp
+        changed = self.publish(url_path, data, mtime=stat.st_mtime)
+        if changed:
+            logger.info("Loaded %s as %s (%d bytes)", file_path, url_path, len(data))
+        return changed
+
+    async def poll(self, interval):
+        """Reload watched files every ``interval`` seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            for url_path in list(self._sources):
+                try:
+                    self.reload(url_path)
+                except OSError as e:
+                    logger.warning("Error reloading %s: %s", url_path, e)
+
+
+def not_modified(body, headers, etag):
+    """Return True if the request's validators match ``body``."""
+    if_none_match = headers.get('if-none-match')
+    if if_none_match is not None:
+        if if_none_match.strip() == '*':
+            return True
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return etag in tags
+    if_modified_since = headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return body.mtime <= since
+    return False
+
+
+def accepts_gzip(headers):
+    for coding in headers.get('accept-encoding', '').split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip().lower() in ('gzip', 'x-gzip'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+
+async def read_request(reader):
+    """Read one request head; return (method, path, version, headers) or None.
+
+    A malformed or oversized head comes back as method ``'BAD'`` (a 400).
+    """
+    try:
+        request_line = await reader.readline()
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+        return None
+    if not request_line:
+        return None
+    parts = request_line.decode('latin-1').split()
+    if len(parts) != 3:
+        return 'BAD', None, 'HTTP/1.0', {}
+    method, target, version = parts
+    headers = {}
+    while True:
+        try:
+            line = await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            return 'BAD', None, version, {}
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    path = target.split('?', 1)[0]
+    return method, path, version, headers
+
+
+def build_response(store, method, path, headers):
+    """Return (status, response headers, body bytes) for one request."""
+    if method == 'BAD':
+        return 400, {}, b''
+    if method not in ('GET', 'HEAD'):
+        return 405, {'Allow': 'GET, HEAD'}, b''
+    body = store.get(path)
+    if body is None:
+        return 404, {'Content-Type': 'text/plain; charset=utf-8'}, b'Not found\n'
+
+    use_gzip = accepts_gzip(headers)
+    etag = body.gzip_etag if use_gzip else body.etag
+    response_headers = {
+        'ETag': etag,
+        'Last-Modified': body.last_modified,
+        'Cache-Control': 'public, max-age=60',
+        'Vary': 'Accept-Encoding',
+    }
+    if not_modified(body, headers, etag):
+        return 304, response_headers, b''
+
+    response_headers['Content-Type'] = body.content_type
+    if use_gzip:
+        response_headers['Content-Encoding'] = 'gzip'
+        return 200, response_headers, body.gzipped
+    return 200, response_headers, body.data
+
+
+def has_body(headers):
+    """Return True if the request head announces a body."""
+    return 'transfer-encoding' in headers or headers.get('content-length', '0').strip() not in ('', '0')
+
+
+def make_handler(store):
+    async def handle(reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, version, headers = request
+                status, response_headers, payload = build_response(store, method, path, headers)
+
+                # Request bodies are never read, so anything that may have sent one
+                # closes the connection rather than parse the body as the next request
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                              and status not in (400, 405) and not has_body(headers))
+                response_headers['Date'] = formatdate(usegmt=True)
+                if status != 304:
+                    response_headers['Content-Length'] = str(len(payload))
+                response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+                head = f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                head += ''.join(f"{name}: {value}\r\n" for name, value in response_headers.items())
+                writer.write(head.encode('latin-1') + b'\r\n')
+                if method != 'HEAD' and status != 304:
+                    writer.write(payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def serve(files, host='0.0.0.0', port=8080, poll_interval=5.0):
+    store = FeedStore()
+    for file_path in files:
+        url_path = store.watch(file_path)
+        logger.info("Serving %s at %s", file_path, url_path)
+    server = await asyncio.start_server(make_handler(store), host, port)
+    logger.info("Feed server listening on http://%s:%d", host, port)
+    async with server:
+        await asyncio.gather(server.serve_forever(), store.poll(poll_interval))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve generated feeds from memory with ETag/304 support.')
+    parser.add_argument('files', nargs='+', help='Feed files to serve; each is served at its relative path')
+    parser.add_argument('--host', default='0.0.0.0', help='Address to bind (default: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser.add_argument('--poll', type=float, default=5.0, help='Seconds between checks for rewritten feeds (default: 5)')
+    args = parser.parse_args(argv)
+    setup_logging()
+    try:
+        asyncio.run(serve(args.files, args.host, args.port, args.poll))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Content-addressed archive of raw fetched pages.
+
+Every fetched HTML or JSON payload is stored once under the SHA-256 of its
+content, compressed with zstd when the ``zstandard`` package is installed
+and gzip otherwise. A JSON lines index records when each payload was seen
+and by which source, so a page that has not changed since the last run
+costs one index line and no extra payload bytes.
+
+Archived snapshots can be replayed through a generator's extraction code
+offline with ``--replay`` (see README), and managed with:
+
+    python -m eighthside.snapshots list [--source SOURCE]
+    python -m eighthside.snapshots show HASH
+    python -m eighthside.snapshots prune --keep-days 30 --keep-runs 10
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from eighthside.log import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = 'snapshots'
+DEFAULT_KEEP_DAYS = 30
+
+
+def _compress(data):
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(data), 'zst'
+    return gzip.compress(data, compresslevel=9, mtime=0), 'gz'
+
+
+def _decompress(data, compression):
+    if compression == 'zst':
+        if zstandard is None:
+            raise RuntimeError("this snapshot is zstd-compressed; install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class SnapshotArchive:
+    """A directory holding compressed payload objects and an index."""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self.run = datetime.now().strftime('%Y%m%dT%H%M%S')
+
+    def _object_path(self, digest, compression):
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.{compression}")
+
+    def _find_object(self, digest):
+        for compression in ('zst', 'gz'):
+            path = self._object_path(digest, compression)
+            if os.path.exists(path):
+                return path, compression
+        return None, None
+
+    def store(self, source, payload, kind='html'):
+        """Archive ``payload`` (str or bytes) for ``source``; return its hash."""
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()
+
+        path, compression = self._find_object(digest)
+        if path is None:
+            compressed, compression = _compress(payload)
+            path = self._object_path(digest, compression)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+        entry = {
+            'time': time.time(),
+            'run': self.run,
+            'source': source,
+            'kind': kind,
+            'hash': digest,
+            'size': len(payload),
+            'compression': compression,
+        }
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return digest
+
+    def entries(self, source=None):
+        """Return index entries, oldest first, optionally for one source."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        if source is not None:
+            entries = [entry for entry in entries if entry['source'] == source]
+        return entries
+
+    def load(self, digest):
+        """Return the decompressed payload for a full hash."""
+        path, compression = self._find_object(digest)
+        if path is None:
+            raise KeyError(f"No snapshot with hash {digest}")
+        with open(path, 'rb') as f:
+            return _decompress(f.read(), compression)
+
+    def resolve(self, ref, source=None):
+        """Return the index entries a replay reference points to.
+
+        ``ref`` is ``latest`` (every snapshot from the source's most recent
+        run), a run ID, or a hash prefix.
+        """
+        entries = self.entries(source)
+        if ref == 'latest':
+            if not entries:
+                return []
+            last_run = entries[-1]['run']
+            return [entry for entry in entries if entry['run'] == last_run]
+        by_run = [entry for entry in entries if entry['run'] == ref]
+        if by_run:
+            return by_run
+        matches = {}
+        for entry in entries:
+            if entry['hash'].startswith(ref):
+                matches[entry['hash']] = entry
+        if len(matches) > 1:
+            raise ValueError(f"Snapshot reference {ref!r} is ambiguous")
+        return list(matches.values())
+
+    def prune(self, keep_days=DEFAULT_KEEP_DAYS, keep_runs=None):
+        """Drop old index entries and delete objects nothing refers to.
+
+        Entries younger than ``keep_days`` are kept, as are all entries from
+        each source's ``keep_runs`` most recent runs. Returns the number of
+        objects deleted.
+        """
+        entries = self.entries()
+        cutoff = time.time() - keep_days * 86400 if keep_days is not None else None
+        recent_runs = set()
+        if keep_runs:
+            runs_by_source = {}
+            for entry in entries:
+                runs = runs_by_source.setdefault(entry['source'], [])
+                if entry['run'] not in runs:
+                    runs.append(entry['run'])
+            for source, runs in runs_by_source.items():
+                recent_runs.update((source, run) for run in runs[-keep_runs:])
+
+        kept = [entry for entry in entries
+                if (cutoff is None or entry['time'] >= cutoff)
+                or (entry['source'], entry['run']) in recent_runs]
+        if len(kept) != len(entries):
+            fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                for entry in kept:
+                    f.write(json.dumps(entry) + '\n')
+            os.replace(tmp_path, self.index_path)
+
+        referenced = {entry['hash'] for entry in kept}
+        deleted = 0
+        objects_dir = os.path.join(self.root, 'objects')
+        for dirpath, _, filenames in os.walk(objects_dir):
+            for filename in filenames:
+                if filename.split('.', 1)[0] not in referenced:
+                    os.unlink(os.path.join(dirpath, filename))
+                    deleted += 1
+        return deleted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Inspect and prune the raw page snapshot archive.')
+    parser.add_argument('--root', default=DEFAULT_ROOT, help=f'Archive directory (default: {DEFAULT_ROOT})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='List archived snapshots')
+    list_parser.add_argument('--source', help='Only show snapshots from this source')
+
+    show_parser = subparsers.add_parser('show', help='Write a snapshot to stdout')
+    show_parser.add_argument('ref', help='Hash prefix of the snapshot')
+
+    prune_parser = subparsers.add_parser('prune', help='Apply the retention policy')
+    prune_parser.add_argument('--keep-days', type=int, default=DEFAULT_KEEP_DAYS,
+                              help=f'Keep snapshots younger than N days (default: {DEFAULT_KEEP_DAYS})')
+    prune_parser.add_argument('--keep-runs', type=int, help='Always keep the last N runs of each source')
+
+    args = parser.parse_args(argv)
+    setup_logging()
+    archive = SnapshotArchive(args.root)
+
+    if args.command == 'list':
+        for entry in archive.entries(args.source):
+            when = datetime.fromtimestamp(entry['time']).strftime('%Y-%m-%d %H:%M:%S')
+            sys.stdout.write(f"{when}  {entry['run']}  {entry['source']:<10} {entry['kind']:<5} "
+                             f"{entry['hash'][:12]}  {entry['size']} bytes\n")
+    elif args.command == 'show':
+        entries = archive.resolve(args.ref)
+        if len(entries) != 1:
+            parser.error(f"{args.ref!r} does not name exactly one snapshot")
+        sys.stdout.buffer.write(archive.load(entries[0]['hash']))
+    elif args.command == 'prune':
+        deleted = archive.prune(args.keep_days, args.keep_runs)
+        logger.info("Deleted %d unreferenced snapshot objects", deleted)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Event sources: each turns one site into feed items via the shared pipeline."""
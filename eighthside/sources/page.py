@@ -0,0 +1,157 @@
+"""Events from a single page described by a site adapter (see adapters.py).
+
+The page is fetched with plain HTTP, Playwright or Selenium, chosen from
+each backend's recent record (see selection.py) unless one is forced, and
+the run's extraction plan is applied to the resulting HTML with
+BeautifulSoup, so every backend shares one extractor. The Magic store
+locator is such a page (see wotc.py); ``python -m eighthside site FILE``
+runs any other from a JSON adapter.
+"""
+import logging
+
+from bs4 import BeautifulSoup
+
+from eighthside.backends import get_backend
+from eighthside.resilience import with_retries
+from eighthside.rules import FIELDS as RULE_FIELDS
+from eighthside.selection import BACKEND_COSTS, BackendHistory, escalate
+
+logger = logging.getLogger(__name__)
+
+
+async def collect(run):
+    """Fetch (or replay) the page and add its events to the run."""
+    if run.args.replay:
+        replay = run.replay_snapshots()
+        if replay is None:
+            return
+        archive, snapshots = replay
+        html_content = archive.load(snapshots[-1]['hash']).decode('utf-8')
+
+        # Keep a reference to the page for the diagnostics dump
+        run.recorder.attach('page_content.html', html_content)
+
+        with run.profiler.stage('parse'):
+            event_containers = find_event_containers(run, html_content)
+    else:
+        event_containers = await fetch_event_containers(run)
+
+    # Process event containers if any were found
+    if event_containers:
+        with run.profiler.stage('extract'):
+            process_event_containers(run, event_containers)
+
+
+async def fetch_event_containers(run):
+    """Fetch and parse the page, escalating through backends until one finds events."""
+    history = BackendHistory(run.args.backend_history)
+    if run.args.backend == 'auto':
+        order = history.order(run.source, BACKEND_COSTS)
+    else:
+        order = [run.args.backend]
+
+    async def attempt(name):
+        backend = get_backend(name)
+        logger.info("Using the %s backend to fetch page content...", name)
+        with run.profiler.stage('fetch'):
+            html_content = await with_retries('fetch', lambda: backend.fetch(run, run.plan.url, run.plan.wait_for))
+        if run.archive:
+            run.archive.store(run.source, html_content, 'html')
+
+        # Keep a reference to the page for the diagnostics dump
+        run.recorder.attach(f'page_content-{name}.html', html_content)
+
+        with run.profiler.stage('parse'):
+            event_containers = find_event_containers(run, html_content)
+        return event_containers, len(html_content.encode('utf-8')), not event_containers
+
+    return await escalate(run, history, order, attempt)
+
+
+def find_event_containers(run, html_content):
+    """Parse the page and return the adapter's event containers."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # Class inventory of the document, only built if diagnostics are written
+    def class_inventory():
+        all_classes = set()
+        for tag in soup.find_all(True):
+            if tag.has_attr('class'):
+                all_classes.update(tag.get('class'))
+        return '\n'.join(sorted(all_classes)) + '\n'
+    run.recorder.attach('classes.txt', class_inventory)
+
+    # Counted so the backends probe the selector that showed up last time first
+    run.plan.probe_wait(soup)
+
+    event_containers = run.plan.containers(soup)
+    if not event_containers:
+        logger.warning("No event containers found with %r.", run.plan.adapter.container)
+        if run.debug:
+            # Show which of the page's expected elements did render
+            for selector in run.plan.wait_for:
+                logger.debug("Found %d elements matching %r", len(soup.select(selector)), selector)
+    else:
+        logger.info("Found %d event containers", len(event_containers))
+
+        # First 3 containers, prettified only if diagnostics are written
+        samples = event_containers[:3]
+        run.recorder.attach('sample_containers.html',
+                            lambda: '\n\n'.join(f"<!-- Container {i+1} -->\n{container.prettify()}"
+                                                for i, container in enumerate(samples)))
+
+    return event_containers
+
+
+def process_event_containers(run, event_containers):
+    """Extract, filter and date the events in the containers and add them to the run."""
+    logger.info("Processing %d event containers", len(event_containers))
+    plan = run.plan
+    needs_text = plan.needs_text or run.event_filter.uses_field('text')
+    # The rules only need their own fields, so the rest are read for accepted events only
+    rule_fields = {name for name in RULE_FIELDS if name != 'text' and run.event_filter.uses_field(name)}
+    other_fields = {field.name for field in plan.adapter.fields} - rule_fields
+
+    events_found = 0
+    events_added = 0
+    events_filtered = 0
+    events_skipped_rules = 0
+
+    for container in event_containers:
+        text = container.get_text(" ") if needs_text else ''
+
+        # Apply the filter rules to the raw fields, as the in-page filter does,
+        # before the date fields are read and the patterns run
+        record = plan.read(container, rule_fields)
+        if not run.event_filter.accepts(plan.filter_fields(record, text)):
+            events_skipped_rules += 1
+            continue
+
+        record = plan.complete(plan.read(container, other_fields, record), text)
+        if record is None:
+            # A required field is missing; skip silently
+            continue
+
+        try:
+            parsed = plan.parse_start(record, run.today)
+            if parsed is None:
+                logger.debug("Skipping event without a usable date: %s", record.get('title', ''))
+                continue
+            start, dated = parsed
+            events_found += 1
+
+            # Filter events by date range (today to N days from now)
+            if dated and not run.in_window(start):
+                events_filtered += 1
+                continue
+
+            start, when = plan.localize(record, start, dated)
+            run.add_event(start=start, **plan.render(record, when))
+            events_added += 1
+            logger.debug("Added event: %s on %s", record.get('title', ''), start.date())
+        except Exception as e:
+            logger.warning("Error processing event: %s", e, exc_info=run.debug)
+
+    logger.info("Summary: Found %d valid events, filtered %d by date, skipped %d by filter rules, added %d to feed",
+                events_found, events_filtered, events_skipped_rules, events_added)
+    logger.info("Filter rule hits: %s", run.event_filter.summary())
@@ -0,0 +1,567 @@
+"""Pokemon events at 8th Side from the Pokemon event locator.
+
+Two backends: ``http`` queries the site's backing search API for the
+store's area and date window only; ``playwright`` loads the location
+search page and scrolls until every nearby event has rendered, extracting
+and filtering the event cards inside the page with the compiled adapter
+and rules. By default the order is picked from each backend's recent
+record (see selection.py) and the other one is tried if the first fails
+or finds nothing.
+
+The store's location, the card layout, the date format and the item text
+are in ``ADAPTER``; another store is an adapter with different ``params``.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from bs4 import BeautifulSoup
+
+from eighthside.adapters import Field, Pattern, SiteAdapter
+from eighthside.enrich import DetailCache, enrich_events
+from eighthside.paging import fetch_all_pages
+from eighthside.resilience import throttle, with_retries
+from eighthside.rules import EIGHTH_SIDE_RULES
+from eighthside.selection import BackendHistory, escalate
+
+DESCRIPTION = """
+            <h2>{title}</h2>
+            <p><strong>Date and Time:</strong> {when}</p>
+            <p><strong>Price:</strong> {price}</p>
+            <p><strong>Location:</strong> 8th Side Games</p>
+            <p><a href="{link}">Event Link</a></p>
+            """
+CONTENT = "{title}\nDate: {when}\nPrice: {price}\nLocation: 8th Side Games\nLink: {link}"
+
+ADAPTER = SiteAdapter(
+    name='pokemon',
+    label="Pokemon",
+    # Location search used for the feed link and as the fallback event link
+    url="https://events.pokemon.com/en-us/events?near={near}",
+    params={
+        'near': "4232 Fort St, Lincoln Park, MI 48146, USA",
+        # Where the search API looks for events (--targeted)
+        'latitude': 42.2506,
+        'longitude': -83.1786,
+        'radius_miles': 1,
+        # API times are converted to the store's local time, as shown on its cards
+        'timezone': 'America/Detroit',
+    },
+    feed_title="Pokemon Event Feed",
+    feed_description="Feed of Pokemon events",
+    wait_for=('.event-card',),
+    container='.event-card',
+    fields=(
+        Field('date', ('line:0',), clean='color: #fff;'),
+        Field('distance', ('line:1',)),
+        Field('title', ('line:2',), clean='color: #fff;', default="8th Side Pokemon Event"),
+        # Read for the filter rules, which see the same fields as for an API record
+        Field('store', ('line:3',), default=''),
+        Field('cost', (r're:^\s*(?:\$\s?\d+(?:\.\d{2})?|free)\s*$',), default=''),
+        # The card's own link identifies the event without clicking it
+        Field('href', ('link',), default=''),
+        Field('id', ('@data-event-id', 'link:/events/([^/?#]+)', 'link'), default=''),
+        # Filled from the event's detail page; the usual league price otherwise
+        Field('price', default="$5.00"),
+    ),
+    # Cards and API records both read like "March 11, 2025 6:30PM"
+    patterns=(Pattern(r'(?P<month>[A-Za-z]+)\s+(?P<day>\d{1,2}),\s+(?P<year>\d{4})\s+(?P<time>\d{1,2}:\d{2}[AP]M)',
+                      source='date'),),
+    date="{month} {day}, {year} {time}",
+    date_formats=("%B %d, %Y %I:%M%p",),
+    undated='now',
+    rules=tuple(EIGHTH_SIDE_RULES),
+    # The site's event ID, so neither a price change nor a detail lookup changes the GUID
+    guid=('title', 'when'),
+    guid_key='id',
+    link='{link}',
+    description=DESCRIPTION,
+    content=CONTENT,
+)
+
+# Event details (price, link) are cached between runs and refreshed daily
+DETAIL_CACHE_PATH = 'pokemon/event-details.json'
+DETAIL_CONCURRENCY = 4
+LOW_MEMORY_DETAIL_CONCURRENCY = 1
+
+# Backing search API used by --targeted, queried around the store's location
+EVENTS_API_URL = "https://op-core.pokemon.com/api/v2/event_locator/search/"
+EVENT_PAGE_URL = "https://events.pokemon.com/en-us/events/{id}"
+TARGETED_PAGE_SIZE = 50
+TARGETED_CONCURRENCY = 4
+
+PRICE_PATTERN = re.compile(r'\$\s?\d+(?:\.\d{2})?|\bfree\b', re.IGNORECASE)
+
+# Where an event page shows its price: an element marked up as the price, or
+# else the value next to (or after) a "Cost" / "Entry fee" label. The rest of
+# the page also lists other events and products, so it is never searched.
+DETAIL_PRICE_SELECTORS = ('[data-testid*="price"]', '[data-testid*="cost"]', '[class*="event-price"]',
+                          '[class*="entry-fee"]')
+DETAIL_PRICE_LABEL = r'^(?:cost|price|entry fee|entry|admission)\b\s*:?\s*(.*)$'
+
+# Returns the text of the price element or label value, or null (see price_text_from_html)
+DETAIL_PRICE_SCRIPT = """
+([selectors, labelPattern]) => {
+    for (const selector of selectors) {
+        const element = document.querySelector(selector);
+        if (element && element.innerText.trim()) return element.innerText;
+    }
+    const label = new RegExp(labelPattern, 'i');
+    for (const element of document.querySelectorAll('dt, th, label, span, div, p, strong, b, h3, h4, h5')) {
+        if (element.children.length) continue;
+        const match = element.innerText.trim().match(label);
+        if (!match) continue;
+        if (match[1]) return match[1];
+        const value = element.nextElementSibling || (element.parentElement && element.parentElement.nextElementSibling);
+        if (value && value.innerText.trim()) return value.innerText;
+    }
+    return null;
+}
+"""
+
+logger = logging.getLogger(__name__)
+
+
+async def collect(run):
+    """Fetch (or replay) the store's events and add them to the run."""
+    if run.args.replay:
+        await replay_snapshots(run)
+        return
+    
+    history = BackendHistory(run.args.backend_history)
+    if run.args.targeted:
+        # The page scan is slower but does not depend on the API
+        order = ['http', 'playwright']
+    elif run.args.backend == 'auto':
+        order = history.order(run.source, ['http', 'playwright'])
+    else:
+        order = [run.args.backend]
+    
+    events = await escalate(run, history, order, lambda name: fetch_with(run, name))
+    if events:
+        with run.profiler.stage('extract'):
+            await add_search_events(run, events)
+
+
+async def fetch_with(run, backend):
+    """One attempt for ``selection.escalate``; returns ``(records, size, empty)``.
+
+    The search API (http) returns the store's events, to be added
+    afterwards; the page scan (playwright) extracts in the browser and adds
+    events directly. Either way the attempt only counts as finding something
+    if events pass the rules, not just any nearby store's.
+    """
+    if backend == 'http':
+        logger.info("Querying the Pokemon event search API...")
+        records, size = await fetch_targeted_events(run)
+        with run.profiler.stage('extract'):
+            events = select_search_events(run, records)
+        return events, size, not events
+    logger.info("Using Playwright to fetch Pokemon event data...")
+    size = await fetch_and_process_events(run)
+    return None, size, not run.event_records
+
+
+async def replay_snapshots(run):
+    """Run extraction over archived snapshots instead of the live site."""
+    replay = run.replay_snapshots()
+    if replay is None:
+        return
+    archive, snapshots = replay
+    
+    records = []
+    for snapshot in snapshots:
+        if snapshot['kind'] == 'json':
+            records.extend(parse_search_page(json.loads(archive.load(snapshot['hash'])))[0])
+    html_pages = [s for s in snapshots if s['kind'] == 'html']
+    if records or not html_pages:
+        with run.profiler.stage('extract'):
+            await process_search_records(run, records)
+        return
+    
+    # The API came back empty in that run, so replay the page scan; page
+    # snapshots need the in-page extraction script, so load them into a browser
+    from playwright.async_api import async_playwright
+    from eighthside.backends.playwright import launch_options
+    html_content = archive.load(html_pages[-1]['hash']).decode('utf-8')
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(**launch_options(run.low_memory))
+        # The snapshot's own scripts would re-render it and call the live site,
+        # so they are disabled and every request it makes is aborted
+        context = await browser.new_context(java_script_enabled=False)
+        await context.route('**/*', lambda route: route.abort())
+        page = await context.new_page()
+        await page.set_content(html_content, wait_until="domcontentloaded")
+        with run.profiler.stage('extract'):
+            await process_event_cards(run, page)
+        await browser.close()
+
+
+async def fetch_and_process_events(run):
+    """Fetch and process Pokemon event data using Playwright; returns the page size."""
+    async with contextlib.AsyncExitStack() as stack:
+        with run.profiler.stage('fetch'):
+            page = await with_retries('fetch', lambda: open_search_page(run, stack))
+        try:
+            html_content = await page.content()
+            size = len(html_content.encode('utf-8'))
+            if run.archive:
+                run.archive.store(run.source, html_content, 'html')
+            del html_content
+        
+            # Process the event cards
+            with run.profiler.stage('extract'):
+                await process_event_cards(run, page)
+        except Exception:
+            await capture_page_diagnostics(run, page)
+            raise
+        
+        # The page is only captured when there is something to diagnose
+        if run.debug or not run.event_records:
+            await capture_page_diagnostics(run, page)
+    return size
+
+
+async def open_search_page(run, stack):
+    """Load the search page with every event card; the browser closes with ``stack``.
+
+    If loading fails, the page is captured for diagnostics and the browser
+    closed straight away, so a retry starts from a fresh one.
+    """
+    from eighthside.backends.playwright import open_page
+    async with contextlib.AsyncExitStack() as attempt:
+        browser, page = await attempt.enter_async_context(open_page(run.plan.url, run.low_memory))
+        try:
+            # Wait for the event cards to load
+            await page.wait_for_selector(', '.join(run.plan.wait_for),
+                                         timeout=run.plan.adapter.wait_timeout * 1000)
+        
+            # Scroll down to load all events
+            await scroll_to_load_all_events(page)
+        except Exception:
+            await capture_page_diagnostics(run, page)
+            raise
+        stack.push_async_exit(attempt.pop_all())
+        return page
+
+
+async def capture_page_diagnostics(run, page):
+    """Keep the page HTML and a screenshot in the flight recorder."""
+    if page.is_closed():
+        return
+    try:
+        run.recorder.attach('page_content.html', await page.content())
+        run.recorder.attach('screenshot.png', await page.screenshot(full_page=True))
+    except Exception as e:
+        logger.debug("Could not capture page diagnostics: %s", e)
+
+
+async def scroll_to_load_all_events(page):
+    """Scroll down to load all event cards."""
+    logger.info("Scrolling to load all events...")
+    
+    previous_height = 0
+    current_height = await page.evaluate('document.body.scrollHeight')
+    
+    while previous_height < current_height:
+        await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+        await asyncio.sleep(2)  # Wait for content to load
+        
+        previous_height = current_height
+        current_height = await page.evaluate('document.body.scrollHeight')
+        
+        logger.debug("Scrolled: Previous height: %d, Current height: %d", previous_height, current_height)
+    
+    logger.info("Finished scrolling. All events should be loaded.")
+
+
+def detail_url(event):
+    """Return the URL of an event's own page: the card's link, or else built from its ID."""
+    if event.get('href'):
+        return event['href']
+    if event.get('id'):
+        return EVENT_PAGE_URL.format(id=event['id'])
+    return None
+
+
+def parse_price(text):
+    """Return the price in ``text`` ("$5.00" or "Free"), or None."""
+    price_match = PRICE_PATTERN.search(text) if text else None
+    if not price_match:
+        return None
+    return "Free" if price_match.group(0).lower() == 'free' else price_match.group(0)
+
+
+def price_text_from_html(html_content):
+    """Return the price text of an event page, found as ``DETAIL_PRICE_SCRIPT`` finds it in a browser."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for selector in DETAIL_PRICE_SELECTORS:
+        element = soup.select_one(selector)
+        if element is not None and element.get_text().strip():
+            return element.get_text()
+    label = re.compile(DETAIL_PRICE_LABEL, re.IGNORECASE)
+    for element in soup.find_all(['dt', 'th', 'label', 'span', 'div', 'p', 'strong', 'b', 'h3', 'h4', 'h5']):
+        if element.find(True) is not None:
+            continue
+        match = label.match(element.get_text().strip())
+        if not match:
+            continue
+        if match.group(1):
+            return match.group(1)
+        value = element.find_next_sibling() or (element.parent and element.parent.find_next_sibling())
+        if value is not None and value.get_text().strip():
+            return value.get_text()
+    return None
+
+
+async def fetch_event_detail(context, url):
+    """Open an event's own page in a new tab and pull out its price."""
+    await throttle(url)
+    detail_page = await context.new_page()
+    try:
+        await detail_page.goto(url, wait_until="domcontentloaded")
+        await detail_page.wait_for_load_state('networkidle')
+        text = await detail_page.evaluate(DETAIL_PRICE_SCRIPT, [list(DETAIL_PRICE_SELECTORS), DETAIL_PRICE_LABEL])
+    finally:
+        await detail_page.close()
+    return {'url': url, 'price': parse_price(text)}
+
+
+async def fetch_event_detail_http(run, url):
+    """GET an event's own page without a browser and pull out its price."""
+    from eighthside.backends import http
+    html_content = await http.fetch(run, url)
+    return {'url': url, 'price': parse_price(price_text_from_html(html_content))}
+
+
+def parse_search_page(data):
+    """Return (records, total_pages) from one page of the search API."""
+    records = []
+    for key in ('activities', 'events', 'results', 'data'):
+        if isinstance(data.get(key), list):
+            records = data[key]
+            break
+    total_pages = data.get('total_pages') or data.get('pages')
+    if total_pages is None and data.get('count') is not None:
+        total_pages = -(-int(data['count']) // TARGETED_PAGE_SIZE)
+    return records, total_pages
+
+
+def search_record_to_event(record, timezone):
+    """Convert a search API record to the event shape used for page cards.
+
+    Start times with an offset are converted to ``timezone`` (the store's),
+    whatever the timezone of the machine running the feed.
+    """
+    start_text = record.get('start_datetime') or record.get('when') or record.get('start_date')
+    start = datetime.fromisoformat(str(start_text).replace('Z', '+00:00'))
+    if start.tzinfo is not None:
+        start = start.astimezone(ZoneInfo(timezone)).replace(tzinfo=None)
+    
+    location = record.get('address') or record.get('location') or {}
+    organizer = record.get('organizer') or {}
+    store = location.get('name') or organizer.get('name') or record.get('location_name') or ''
+    
+    event_id = str(record.get('guid') or record.get('id') or '')
+    cost = record.get('cost', record.get('price'))
+    if cost in (None, ''):
+        price = None
+    elif isinstance(cost, (int, float)):
+        price = "Free" if cost == 0 else f"${cost:.2f}"
+    else:
+        price = str(cost)
+    url = EVENT_PAGE_URL.format(id=event_id) if event_id else None
+    
+    hour = start.hour % 12 or 12
+    event = {
+        # Same text as a page card so dates and GUIDs match in both modes
+        'date': f"{start.strftime('%B')} {start.day}, {start.year} {hour}:{start.strftime('%M%p')}",
+        'title': (record.get('name') or record.get('title') or '').strip(),
+        'store': store,
+        'cost': price or '',
+        'href': url or '',
+        'id': event_id,
+    }
+    # Without a price the event is left to the detail cache, like a page card
+    if price is not None:
+        event['detail'] = {'url': url, 'price': price}
+    return event
+
+
+async def fetch_targeted_events(run):
+    """Fetch only the store's events in the date window from the search API.
+
+    Returns ``(records, size)``, size being the bytes of all result pages.
+    """
+    from eighthside.backends import http
+    size = 0
+    
+    async def fetch_page(number):
+        nonlocal size
+        store = run.plan.adapter.params
+        params = {
+            'latitude': store['latitude'],
+            'longitude': store['longitude'],
+            'distance': store['radius_miles'],
+            'start_date': run.today.strftime('%Y-%m-%d'),
+            'end_date': run.window_end.strftime('%Y-%m-%d'),
+            'sort': 'when',
+            'page': number,
+            'per_page': TARGETED_PAGE_SIZE,
+        }
+        body = await with_retries('api', lambda: http.fetch(run, EVENTS_API_URL, params=params,
+                                                            headers={'Accept': 'application/json'}))
+        size += len(body.encode('utf-8'))
+        if run.archive:
+            run.archive.store(run.source, body, 'json')
+        return parse_search_page(json.loads(body))
+    
+    with run.profiler.stage('fetch'):
+        records = await fetch_all_pages(fetch_page, concurrency=TARGETED_CONCURRENCY)
+    return records, size
+
+
+async def process_search_records(run, records):
+    """Filter search API records down to the store's events and add them."""
+    await add_search_events(run, select_search_events(run, records))
+
+
+def select_search_events(run, records):
+    """Return the store's events among search API records.
+
+    Result pages are fetched in parallel, so an event can show up on two of
+    them if the listing shifts in between; only its first record is kept.
+    """
+    logger.info("Search API returned %d events near the store", len(records))
+    eighth_side_events = []
+    seen_ids = set()
+    timezone = run.plan.adapter.params['timezone']
+    for record in records:
+        try:
+            event_data = search_record_to_event(record, timezone)
+        except (TypeError, ValueError) as e:
+            logger.debug("Skipping unreadable search record: %s", e)
+            continue
+        if event_data['id']:
+            if event_data['id'] in seen_ids:
+                logger.debug("Skipping duplicate search record %s", event_data['id'])
+                continue
+            seen_ids.add(event_data['id'])
+        # The text a page card for the event would show
+        text = '\n'.join(value for value in (event_data['date'], event_data['title'],
+                                              event_data['store'], event_data['cost']) if value)
+        if run.event_filter.accepts(run.plan.filter_fields(event_data, text)):
+            eighth_side_events.append(run.plan.complete(event_data))
+    
+    logger.info("Found %d 8th side events", len(eighth_side_events))
+    return eighth_side_events
+
+
+async def add_search_events(run, eighth_side_events):
+    """Add the store's events from the search API to the feed."""
+    # Records without a price get it from the event's page, which needs no browser;
+    # replays only use cached details so they stay offline
+    if run.args.replay:
+        fetch_detail = None
+    else:
+        fetch_detail = lambda event: with_retries('detail', lambda: fetch_event_detail_http(run, detail_url(event)))
+    await add_events_to_feed(run, eighth_side_events, fetch_detail)
+
+
+async def process_event_cards(run, page):
+    """Process all event cards on the page."""
+    # Get all event card elements
+    logger.info("Finding 8th Side events on the page...")
+    
+    # Extract and filter the cards in the page with the compiled adapter and rules so only matches cross over
+    result = await page.evaluate(run.plan.to_javascript(run.event_filter.to_javascript()))
+    run.event_filter.merge_hits(result['hits'])
+    run.plan.merge_usage(result['usage'])
+    eighth_side_events = [record for record in (run.plan.complete(event['record'], event['text'])
+                                                for event in result['events'])
+                          if record is not None]
+    
+    logger.info("Found %d 8th side events", len(eighth_side_events))
+    
+    # The search page holds every nearby store's events; with --low-memory it
+    # is closed before the detail pages open in the same context
+    context = page.context
+    if run.low_memory:
+        if run.debug or not eighth_side_events:
+            await capture_page_diagnostics(run, page)
+        await page.close()
+    
+    # Replays only use cached details so they stay offline
+    if run.args.replay:
+        fetch_detail = None
+    else:
+        fetch_detail = lambda event: with_retries('detail', lambda: fetch_event_detail(context, detail_url(event)))
+    await add_events_to_feed(run, eighth_side_events, fetch_detail)
+
+
+async def add_events_to_feed(run, eighth_side_events, fetch_detail):
+    """Filter events by date, look up their details and add them to the feed."""
+    plan = run.plan
+    events_found = len(eighth_side_events)
+    events_added = 0
+    events_filtered = 0
+    in_window_events = []
+    
+    for event_data in eighth_side_events:
+        try:
+            logger.debug("Processing event: %s on %s", event_data['title'], event_data.get('date', ''))
+            
+            # Events whose date cannot be read are kept and dated today
+            event_date, dated = plan.parse_start(event_data, run.today)
+            
+            # Filter events by date range (today to N days from now)
+            if dated and not run.in_window(event_date):
+                logger.debug("Skipping event outside date range: %s on %s", event_data['title'], event_date.date())
+                events_filtered += 1
+                continue
+            if not dated:
+                logger.debug("Could not parse date for event: %s, %s", event_data['title'], event_data.get('date', ''))
+            
+            event_data['start'], event_data['when'] = plan.localize(event_data, event_date, dated)
+            in_window_events.append(event_data)
+            
+        except Exception as e:
+            logger.warning("Error processing event: %s", e, exc_info=run.debug)
+    
+    # Look up the price and link of each remaining event, reusing cached details
+    detail_cache = DetailCache(DETAIL_CACHE_PATH)
+    enrich_stats = await enrich_events(
+        in_window_events,
+        fetch_detail,
+        detail_cache,
+        concurrency=LOW_MEMORY_DETAIL_CONCURRENCY if run.low_memory else DETAIL_CONCURRENCY,
+    )
+    if not run.args.replay:
+        detail_cache.prune(event['id'] for event in eighth_side_events if event.get('id'))
+        detail_cache.save()
+    logger.info("Event details: %d cached, %d fetched, %d failed",
+                enrich_stats['cached'], enrich_stats['fetched'], enrich_stats['failed'])
+    
+    for event_data in in_window_events:
+        try:
+            detail = event_data.get('detail') or {}
+            
+            # Fall back to the card's link or ID (or the location search) and the usual
+            # league price when the event has no detail page or it could not be fetched
+            event_data['link'] = detail.get('url') or detail_url(event_data) or plan.url
+            event_data['price'] = detail.get('price') or event_data['price']
+            
+            run.add_event(start=event_data['start'], **plan.render(event_data, event_data['when']))
+            events_added += 1
+            logger.debug("Added event: %s", event_data['title'])
+            
+        except Exception as e:
+            logger.warning("Error processing event: %s", e, exc_info=run.debug)
+    
+    logger.info("Summary: Found %d 8th side events, filtered %d by date, added %d to feed",
+                events_found, events_filtered, events_added)
+    logger.info("Filter rule hits: %s", run.event_filter.summary())
@@ -0,0 +1,44 @@
+"""Magic: The Gathering events from the Wizards store locator page.
+
+The store page is an ordinary adapter-driven page (see page.py); what is
+specific to the locator is ``ADAPTER``. Another store is the same adapter
+with a different ``store_id`` (``--adapter``).
+"""
+from eighthside.adapters import Field, Pattern, SiteAdapter
+from eighthside.rules import CASUAL_PLAY_RULES
+from eighthside.sources.page import collect  # noqa: F401 (the source's entry point)
+
+WEEKDAYS = r'Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday'
+MONTHS = r'January|February|March|April|May|June|July|August|September|October|November|December'
+
+ADAPTER = SiteAdapter(
+    name='wotc',
+    label="Magic: The Gathering",
+    url="https://locator.wizards.com/store/{store_id}",
+    params={'store_id': 14936},
+    # Probed in order by the browser backends to wait for the event list
+    wait_for=('.store-info', '.event-container', '.event-listing', '[data-testid*="event"]',
+              '.calendar', '.schedule'),
+    container='.store-info',
+    fields=(
+        Field('store', ('.store-info__name', '.store-name', 'h2', 'h3'), label="Store Name", listed=True),
+        Field('title', ('.row.no-gutters', '.event-title', '.event-name', 'h4', 'h5'),
+              label="Event Name", required=True),
+        Field('cost', ('.event-fee', '.price', '.cost', r're:\$\d+|\bfree\b'),
+              label="Event Cost", default="Not specified", listed=True),
+        Field('day_of_week', ('.dayOfWeek.text-center', '.day-of-week', f're:{WEEKDAYS}'), label="Day of Week"),
+        Field('month', ('.month.text-center', '.month', f're:{MONTHS}'), label="Month"),
+        Field('day', ('.dayOfMonth.text-center', '.day-of-month', '.date', r're:\b\d{1,2}\b'), label="Day"),
+        Field('time', ('.event-time', '.time', r're:\d{1,2}:\d{2}(?:\s*[AP]M)?'),
+              label="Event Time", default="12:00 PM"),
+    ),
+    # A full date string, for when the individual parts are not marked up
+    patterns=(Pattern(rf'(?P<day_of_week>{WEEKDAYS}),?\s*(?P<month>{MONTHS})\s*(?P<day>\d{{1,2}})'),),
+    date="{day_of_week}, {month} {day}, {year} , {time}",
+    date_formats=("%A, %B %d, %Y , %I:%M %p",),
+    roll_year=True,
+    shift_hours=-5,
+    when_format="%A, %B %d, %I:%M %p",
+    rules=tuple(CASUAL_PLAY_RULES),
+    guid=('title', 'cost', 'when'),
+)
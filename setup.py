@@ -37,10 +37,9 @@ def main():
     print("\nEnvironment setup complete!")
     print(f"\nTo activate the virtual environment, run:")
     print(f"  {activate_cmd}")
-    print("\nTo run the feed generator:")
-    print("  python feedgen-new.py")
-    print("  or")
-    print("  python feedgen-playwright.py (for JavaScript-rendered sites)")
+    print("\nTo run the feed generators:")
+    print("  python -m eighthside wotc")
+    print("  python -m eighthside pokemon")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,104 @@
+from datetime import datetime
+
+import pytest
+from bs4 import BeautifulSoup
+
+from eighthside.adapters import Field, SiteAdapter, adapter_from_dict, compile_adapter
+
+ADAPTER = {
+    'name': 'mystore',
+    'label': "Events",
+    'url': "https://example.org/{store_id}",
+    'params': {'store_id': 7},
+    'container': '.event',
+    'fields': [
+        {'name': 'title', 'sources': ['.name', 'h4'], 'required': True},
+        {'name': 'id', 'sources': ['@data-id'], 'default': ''},
+        {'name': 'date', 'sources': ['p']},
+    ],
+    'date_formats': ['%Y-%m-%d %H:%M'],
+    'guid': ['title', 'when'],
+}
+
+PAGE = """
+<div class="event" data-id="e1"><h4>Fallback</h4><span class="name">Draft</span><p>2026-10-20 18:00</p></div>
+<div class="event"><h4>Sealed</h4><p>2026-10-21 18:00</p></div>
+<div class="event"><p>no title</p></div>
+"""
+
+
+def test_fields_are_read_with_fallbacks_in_order():
+    plan = compile_adapter(adapter_from_dict(ADAPTER))
+    assert plan.url == "https://example.org/7"
+    records = [plan.complete(plan.read(c)) for c in plan.containers(BeautifulSoup(PAGE, 'html.parser'))]
+    assert [r and r['title'] for r in records] == ['Draft', 'Sealed', None]
+    assert records[0]['id'] == 'e1'
+    assert plan.parse_start(records[0], datetime(2026, 10, 19)) == (datetime(2026, 10, 20, 18), True)
+    assert plan.usage['title'] == {'.name': [1, 2], 'h4': [1, 1]}
+
+
+def test_guid_key_makes_the_guid_when_present():
+    plan = compile_adapter(adapter_from_dict({**ADAPTER, 'guid_key': 'id'}))
+    first = plan.render({'title': 'Draft', 'id': 'e1', 'price': '$5'}, 'Tuesday')
+    again = plan.render({'title': 'Draft (changed)', 'id': 'e1', 'price': '$10'}, 'Wednesday')
+    no_id = plan.render({'title': 'Draft', 'id': ''}, 'Tuesday')
+    assert first['guid'] == again['guid']
+    assert no_id['guid'] != first['guid']
+
+
+@pytest.mark.parametrize('change', [
+    {'fields': [{'name': 'title', 'sources': ['line:abc']}]},
+    {'bogus': 1},
+    {'fields': ['title']},
+    {'guid': ['missing']},
+    {'guid_key': 'missing'},
+])
+def test_bad_adapters_raise_value_error(change):
+    with pytest.raises(ValueError):
+        adapter_from_dict({**ADAPTER, **change})
+
+
+def test_missing_keys_raise_value_error():
+    with pytest.raises(ValueError):
+        adapter_from_dict({'name': 'x'})
+
+
+def test_builtin_adapters_compile():
+    from eighthside.sources import pokemon, wotc
+    for adapter in (wotc.ADAPTER, pokemon.ADAPTER):
+        assert isinstance(adapter, SiteAdapter)
+        assert compile_adapter(adapter).fields
+    assert isinstance(wotc.ADAPTER.fields[0], Field)
+
+
+@pytest.mark.parametrize('change', [
+    {'fields': [{'name': 'title', 'sources': ['re:(unclosed']}]},
+    {'container': '.a['},
+])
+def test_bad_selectors_and_regexes_are_usage_errors(tmp_path, capsys, change):
+    import json
+
+    from eighthside.cli import main
+    path = tmp_path / 'bad.json'
+    path.write_text(json.dumps({**ADAPTER, **change}))
+    with pytest.raises(SystemExit) as exit_info:
+        main(['site', str(path)])
+    assert exit_info.value.code == 2
+    assert "bad adapter" in capsys.readouterr().err
+
+
+def test_rules_run_before_the_other_fields_are_read():
+    from types import SimpleNamespace
+
+    from eighthside.rules import Rule, compile_rules
+    from eighthside.sources.page import process_event_containers
+    plan = compile_adapter(adapter_from_dict(ADAPTER))
+    added = []
+    run = SimpleNamespace(plan=plan, event_filter=compile_rules([Rule('draft', 'draft')]), debug=False,
+                          today=datetime(2026, 10, 19), in_window=lambda start: True,
+                          add_event=lambda start, **item: added.append(item['title']))
+    process_event_containers(run, plan.containers(BeautifulSoup(PAGE, 'html.parser')))
+    assert added == ['Sealed']
+    assert run.event_filter.hits == {'draft': 1}
+    # The rejected draft's date was never read
+    assert plan.usage['date'] == {'p': [2, 0]}
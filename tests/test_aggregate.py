@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+
+from eighthside.aggregate import merge_events, normalize_key, read_events, write_events
+
+
+def event(title, day, hour=18, minute=0, source=None):
+    record = {'title': title, 'start': datetime(2026, 10, day, hour, minute)}
+    if source:
+        record['source'] = source
+    return record
+
+
+def titles(events):
+    return [e['title'] for e in events]
+
+
+def test_normalize_key_ignores_case_order_accents_and_the_store_name():
+    assert normalize_key("Pokémon League at 8th Side Games") == normalize_key("8th side: League, Pokemon")
+
+
+def test_merge_is_in_start_order_across_streams():
+    first = [event('a', 1), event('c', 3), event('e', 5)]
+    second = [event('b', 2), event('d', 4)]
+    assert titles(merge_events([iter(first), iter(second)])) == ['a', 'b', 'c', 'd', 'e']
+
+
+def test_near_identical_events_are_kept_once():
+    wotc = [event("Friday Night Magic", 2, 18, 0, 'wotc')]
+    other = [event("friday night magic!", 2, 18, 15, 'other'), event("Friday Night Magic", 9, 18, 0, 'other')]
+    merged = list(merge_events([iter(wotc), iter(other)]))
+    assert [(e['source'], e['start'].day) for e in merged] == [('wotc', 2), ('other', 9)]
+
+
+def test_same_source_events_are_not_deduped():
+    # Two tables of the same event at one store, then another site's copy of it
+    wotc = [event("Commander Night", 2, 18, 0, 'wotc'), event("Commander Night", 2, 18, 10, 'wotc')]
+    other = [event("Commander Night", 2, 18, 20, 'other')]
+    merged = list(merge_events([iter(wotc), iter(other)]))
+    assert [(e['source'], e['start'].minute) for e in merged] == [('wotc', 0), ('wotc', 10)]
+
+
+def test_same_title_outside_the_tolerance_is_kept():
+    stream = [event("League", 2, 18, 0), event("League", 2, 19, 0)]
+    assert len(list(merge_events([iter(stream)], tolerance=timedelta(minutes=30)))) == 2
+
+
+def test_window_and_limit():
+    stream = [event(str(day), day) for day in range(1, 11)]
+    merged = merge_events([iter(stream)], start=datetime(2026, 10, 3), end=datetime(2026, 10, 8))
+    assert titles(merged) == ['3', '4', '5', '6', '7']
+    assert titles(merge_events([iter(stream)], limit=2)) == ['1', '2']
+
+
+def test_merge_stops_reading_after_the_window():
+    read = []
+
+    def stream():
+        for day in range(1, 31):
+            read.append(day)
+            yield event(str(day), day)
+
+    list(merge_events([stream()], end=datetime(2026, 10, 5)))
+    assert read == [1, 2, 3, 4, 5]
+
+
+def test_events_round_trip_sorted(tmp_path):
+    path = tmp_path / 'feed.events.jsonl'
+    write_events(path, [event('later', 9), event('sooner', 2)])
+    events = list(read_events(path, source='wotc'))
+    assert titles(events) == ['sooner', 'later']
+    assert events[0]['start'] == datetime(2026, 10, 2, 18)
+    assert events[0]['source'] == 'wotc'
@@ -0,0 +1,95 @@
+import asyncio
+
+from eighthside.enrich import DetailCache, enrich_events
+
+
+def events(*ids):
+    return [{'id': event_id, 'title': f"Event {event_id}"} for event_id in ids]
+
+
+def test_details_are_fetched_and_cached(tmp_path):
+    path = str(tmp_path / 'details.json')
+    fetched = []
+
+    async def fetch_detail(event):
+        fetched.append(event['id'])
+        return {'price': f"${event['id']}.00"}
+
+    cache = DetailCache(path)
+    batch = events('1', '2')
+    stats = asyncio.run(enrich_events(batch, fetch_detail, cache))
+    assert stats == {'cached': 0, 'fetched': 2, 'failed': 0}
+    assert batch[0]['detail'] == {'price': "$1.00"}
+    cache.save()
+
+    # The next run only fetches the event it has not seen
+    fetched.clear()
+    stats = asyncio.run(enrich_events(events('1', '3'), fetch_detail, DetailCache(path)))
+    assert stats == {'cached': 1, 'fetched': 1, 'failed': 0}
+    assert fetched == ['3']
+
+
+def test_stale_entries_are_refetched(tmp_path):
+    cache = DetailCache(str(tmp_path / 'details.json'), ttl=60)
+    cache.put('1', {'price': "$1.00"}, now=0)
+    assert cache.get('1', now=30) == {'price': "$1.00"}
+    assert cache.get('1', now=61) is None
+
+
+def test_failed_fetch_falls_back_to_a_stale_entry(tmp_path):
+    cache = DetailCache(str(tmp_path / 'details.json'), ttl=60)
+    cache.put('1', {'price': "$1.00"}, now=0)
+
+    async def fetch_detail(event):
+        raise TimeoutError("detail page timed out")
+
+    batch = events('1', '2')
+    stats = asyncio.run(enrich_events(batch, fetch_detail, cache))
+    assert stats == {'cached': 0, 'fetched': 0, 'failed': 2}
+    assert batch[0]['detail'] == {'price': "$1.00"}
+    assert 'detail' not in batch[1]
+
+
+def test_events_with_details_or_without_an_id_are_left_alone(tmp_path):
+    async def fetch_detail(event):
+        raise AssertionError("should not be fetched")
+
+    batch = [{'id': '1', 'detail': {'price': "Free"}}, {'id': '', 'title': "no id"}]
+    stats = asyncio.run(enrich_events(batch, fetch_detail, DetailCache(str(tmp_path / 'd.json'))))
+    assert stats == {'cached': 0, 'fetched': 0, 'failed': 0}
+
+
+def test_without_a_fetcher_only_the_cache_is_used(tmp_path):
+    cache = DetailCache(str(tmp_path / 'details.json'))
+    cache.put('1', {'price': "$1.00"})
+    batch = events('1', '2')
+    stats = asyncio.run(enrich_events(batch, None, cache))
+    assert stats == {'cached': 1, 'fetched': 0, 'failed': 0}
+    assert 'detail' not in batch[1]
+
+
+def test_concurrency_is_bounded(tmp_path):
+    running = 0
+    peak = 0
+
+    async def fetch_detail(event):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {}
+
+    asyncio.run(enrich_events(events(*map(str, range(10))), fetch_detail,
+                              DetailCache(str(tmp_path / 'd.json')), concurrency=3))
+    assert peak == 3
+
+
+def test_prune_and_save_round_trip(tmp_path):
+    path = str(tmp_path / 'details.json')
+    cache = DetailCache(path)
+    cache.put('1', {'price': "$1.00"})
+    cache.put('2', {'price': "$2.00"})
+    cache.prune(['2'])
+    cache.save()
+    assert set(DetailCache(path).entries) == {'2'}
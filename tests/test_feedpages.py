@@ -0,0 +1,84 @@
+import gzip
+import os
+import xml.etree.ElementTree as ElementTree
+from datetime import datetime
+
+from eighthside.feedpages import read_page_events, write_feed_pages
+
+FEED_INFO = {'title': "8th Side Event Feed", 'link': "https://example.org/", 'description': "All events"}
+
+
+def event(title, month, day):
+    return {'title': title, 'start': datetime(2026, month, day, 18), 'link': f"https://example.org/{title}",
+            'description': f"<p>{title}</p>", 'guid': title, 'source': 'wotc'}
+
+
+def items(path):
+    return [e['title'] for e in read_page_events(path)]
+
+
+def links(path):
+    root = ElementTree.parse(path).getroot()
+    return {link.get('rel'): link.get('href') for link in root.iter('{http://www.w3.org/2005/Atom}link')}
+
+
+def test_current_feed_and_monthly_pages(tmp_path):
+    path = str(tmp_path / 'all.rss')
+    events = [event('a', 10, 20), event('b', 10, 25), event('c', 11, 2)]
+    counts = write_feed_pages(events, path, FEED_INFO, page_size=2, build_date=datetime(2026, 10, 19))
+
+    assert counts == {'written': 3, 'unchanged': 0, 'removed': 0}
+    assert items(path) == ['a', 'b']
+    assert items(str(tmp_path / 'all-2026-10.rss')) == ['a', 'b']
+    assert items(str(tmp_path / 'all-2026-11.rss')) == ['c']
+    with open(path, 'rb') as f, gzip.open(path + '.gz') as g:
+        assert f.read() == g.read()
+    assert links(str(tmp_path / 'all-2026-10.rss')) == {
+        'self': 'all-2026-10.rss', 'first': 'all.rss', 'previous': 'all.rss',
+        'next': 'all-2026-11.rss', 'last': 'all-2026-11.rss'}
+
+
+def test_unchanged_pages_are_not_rewritten(tmp_path):
+    path = str(tmp_path / 'all.rss')
+    events = [event('a', 10, 20), event('c', 11, 2)]
+    write_feed_pages(events, path, FEED_INFO, page_size=2, build_date=datetime(2026, 10, 19))
+    mtime = os.stat(path).st_mtime_ns
+    counts = write_feed_pages(events, path, FEED_INFO, page_size=2, build_date=datetime(2026, 10, 19))
+    assert counts == {'written': 0, 'unchanged': 3, 'removed': 0}
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_past_events_stay_on_their_monthly_page(tmp_path):
+    path = str(tmp_path / 'all.rss')
+    write_feed_pages([event('a', 10, 20), event('b', 10, 25), event('c', 11, 2)], path, FEED_INFO,
+                     page_size=2, build_date=datetime(2026, 10, 19))
+
+    # A week into November: a, b and c have passed, and d and e are new
+    write_feed_pages([event('d', 11, 20), event('e', 12, 2)], path, FEED_INFO,
+                     page_size=2, build_date=datetime(2026, 11, 5))
+
+    assert items(path) == ['d', 'e']
+    assert items(str(tmp_path / 'all-2026-10.rss')) == ['a', 'b']
+    assert items(str(tmp_path / 'all-2026-11.rss')) == ['c', 'd']
+    assert items(str(tmp_path / 'all-2026-12.rss')) == ['e']
+    assert read_page_events(str(tmp_path / 'all-2026-10.rss'))[0]['start'] == datetime(2026, 10, 20, 18)
+
+
+def test_upcoming_events_are_replaced(tmp_path):
+    path = str(tmp_path / 'all.rss')
+    write_feed_pages([event('a', 10, 20), event('b', 10, 25)], path, FEED_INFO,
+                     page_size=2, build_date=datetime(2026, 10, 19))
+    # b was cancelled before it happened
+    write_feed_pages([event('c', 10, 27)], path, FEED_INFO, page_size=2, build_date=datetime(2026, 10, 22))
+    assert items(str(tmp_path / 'all-2026-10.rss')) == ['a', 'c']
+
+
+def test_page_left_without_events_is_removed(tmp_path):
+    path = str(tmp_path / 'all.rss')
+    write_feed_pages([event('a', 10, 20), event('c', 11, 2)], path, FEED_INFO,
+                     page_size=2, build_date=datetime(2026, 10, 19))
+    counts = write_feed_pages([event('a', 10, 20)], path, FEED_INFO,
+                              page_size=2, build_date=datetime(2026, 10, 19))
+    assert counts['removed'] == 1
+    assert not os.path.exists(tmp_path / 'all-2026-11.rss')
+    assert not os.path.exists(tmp_path / 'all-2026-11.rss.gz')
@@ -0,0 +1,14 @@
+import logging
+
+from eighthside.log import setup_logging
+
+
+def test_recorder_keeps_package_debug_but_not_third_party_debug():
+    recorder = setup_logging()
+    try:
+        logging.getLogger('eighthside.sources.wotc').debug("selector %s matched", '.event')
+        logging.getLogger('urllib3.connectionpool').debug("Starting new HTTPS connection")
+        logging.getLogger('urllib3.connectionpool').warning("Retrying")
+        assert [r.getMessage() for r in recorder.records] == ["selector .event matched", "Retrying"]
+    finally:
+        logging.getLogger().handlers.clear()
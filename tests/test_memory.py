@@ -0,0 +1,47 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from eighthside.memory import MemoryWatch, _descendants
+
+needs_proc = pytest.mark.skipif(not os.path.isdir('/proc'), reason="needs /proc")
+
+
+@needs_proc
+def test_child_processes_are_found_and_measured():
+    child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    try:
+        assert child.pid in _descendants(os.getpid())
+        watch = MemoryWatch()
+        watch.sample()
+        assert watch.peak_children > 0
+        assert watch.peak_total == watch.peak_self + watch.peak_children
+    finally:
+        child.kill()
+        child.wait()
+
+
+@needs_proc
+def test_going_over_the_limit_cancels_the_task():
+    async def run():
+        task = asyncio.current_task()
+        watch = MemoryWatch(limit_mib=1, interval=0.01)
+        watch.start(task)
+        try:
+            await asyncio.sleep(5)
+        finally:
+            watch.stop()
+        return watch
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(run())
+
+
+def test_report_mentions_the_limit():
+    watch = MemoryWatch(limit_mib=512)
+    watch.stop()
+    assert watch.peak_self > 0
+    assert "limit 512 MiB" in watch.report() or "not measured" in watch.report()
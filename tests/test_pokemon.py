@@ -0,0 +1,113 @@
+import asyncio
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from eighthside.adapters import compile_adapter
+from eighthside.profiling import make_profiler
+from eighthside.rules import Rule, compile_rules
+from eighthside.sources import pokemon
+from eighthside.sources.pokemon import ADAPTER, detail_url, parse_price, price_text_from_html, search_record_to_event
+
+TIMEZONE = ADAPTER.params['timezone']
+
+
+@pytest.fixture
+def utc_host(monkeypatch):
+    """Run the test as if the machine's local timezone were UTC."""
+    monkeypatch.setenv('TZ', 'UTC')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize('start', ['2025-03-11T18:30:00-04:00', '2025-03-11T22:30:00Z'])
+def test_start_is_in_the_store_timezone_whatever_the_host(utc_host, start):
+    event = search_record_to_event({'id': 'abc', 'name': "League Cup", 'start_datetime': start}, TIMEZONE)
+    assert event['date'] == "March 11, 2025 6:30PM"
+
+
+def test_detail_is_only_set_when_the_record_has_a_price():
+    record = {'id': 'abc', 'name': "League", 'start_datetime': '2025-03-11T18:30:00-04:00'}
+    assert 'detail' not in search_record_to_event(record, TIMEZONE)
+    event = search_record_to_event({**record, 'cost': 0}, TIMEZONE)
+    assert event['detail'] == {'url': "https://events.pokemon.com/en-us/events/abc", 'price': "Free"}
+
+
+@pytest.mark.parametrize('html, price', [
+    ('<div class="event-price"> $10.00 </div><p>Booster box $99.99</p>', "$10.00"),
+    ('<dl><dt>Cost</dt><dd>Free</dd></dl><p>Price: $99.99</p>', "Free"),
+    ('<ul><li><span>Entry fee: $5</span></li></ul>', "$5"),
+    ('<p>Booster box $99.99</p>', None),
+])
+def test_event_page_price_is_read_like_the_browser_script(html, price):
+    assert parse_price(price_text_from_html(html)) == price
+
+
+def test_detail_url_falls_back_to_the_event_id():
+    assert detail_url({'href': "https://example.com/e/1", 'id': '1'}) == "https://example.com/e/1"
+    assert detail_url({'href': '', 'id': 'abc'}) == "https://events.pokemon.com/en-us/events/abc"
+    assert detail_url({'href': '', 'id': ''}) is None
+
+
+def search_run(tmp_path, monkeypatch):
+    """A run over the real adapter and rules that collects the feed items it adds."""
+    monkeypatch.setattr(pokemon, 'DETAIL_CACHE_PATH', str(tmp_path / 'details.json'))
+    items = []
+    run = SimpleNamespace(
+        args=SimpleNamespace(replay=None), plan=compile_adapter(ADAPTER), event_filter=compile_rules(ADAPTER.rules),
+        low_memory=False, debug=False, profiler=make_profiler(None), today=datetime(2025, 3, 1), in_window=lambda start: True,
+        add_event=lambda start, **item: items.append(item))
+    return run, items
+
+
+def test_api_records_without_a_price_get_it_from_the_event_page(tmp_path, monkeypatch):
+    fetched = []
+
+    async def fetch_event_detail_http(run, url):
+        fetched.append(url)
+        return {'url': url, 'price': "$12.00"}
+
+    monkeypatch.setattr(pokemon, 'fetch_event_detail_http', fetch_event_detail_http)
+    run, items = search_run(tmp_path, monkeypatch)
+    store = {'name': "8th Side Games"}
+    records = [
+        {'id': 'abc', 'name': "League Challenge", 'start_datetime': '2025-03-11T18:30:00-04:00', 'address': store},
+        {'id': 'def', 'name': "League Cup", 'start_datetime': '2025-03-12T18:30:00-04:00', 'address': store, 'cost': 25},
+    ]
+    asyncio.run(pokemon.process_search_records(run, records))
+    assert fetched == ["https://events.pokemon.com/en-us/events/abc"]
+    assert ["$12.00" in item['description'] for item in items] == [True, False]
+    assert "$25.00" in items[1]['description']
+
+
+def test_api_attempt_is_empty_when_no_event_is_at_the_store(tmp_path, monkeypatch):
+    run, _ = search_run(tmp_path, monkeypatch)
+    nearby = [{'id': 'x', 'name': "League Cup", 'start_datetime': '2025-03-11T18:30:00-04:00',
+               'address': {'name': "Another Game Store"}}]
+
+    async def fetch_targeted_events(run):
+        return nearby, 100
+
+    monkeypatch.setattr(pokemon, 'fetch_targeted_events', fetch_targeted_events)
+    assert asyncio.run(pokemon.fetch_with(run, 'http')) == ([], 100, True)
+
+
+def test_api_records_are_filtered_on_the_same_fields_as_page_cards(tmp_path, monkeypatch):
+    run, _ = search_run(tmp_path, monkeypatch)
+    run.event_filter = compile_rules([*ADAPTER.rules, Rule('paid', '$', field='cost'),
+                                      Rule('other', 'other', field='store')])
+    store = {'name': "8th Side Games"}
+    records = [
+        {'id': 'a', 'name': "League Cup", 'start_datetime': '2025-03-11T18:30:00-04:00', 'address': store, 'cost': 25},
+        {'id': 'b', 'name': "League", 'start_datetime': '2025-03-11T18:30:00-04:00', 'address': store, 'cost': 0},
+        {'id': 'c', 'name': "8th Side night", 'start_datetime': '2025-03-11T18:30:00-04:00',
+         'address': {'name': "Other store"}},
+    ]
+    assert [event['id'] for event in pokemon.select_search_events(run, records)] == ['b']
+    assert run.event_filter.hits == {'paid': 1, 'other': 1, '8th side': 1}
+    names = {field.name for field in ADAPTER.fields}
+    assert {'title', 'store', 'cost'} <= names
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from eighthside import resilience
+from eighthside.resilience import CircuitBreaker, TokenBucket, is_retryable
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake monotonic clock that ``asyncio.sleep`` in resilience.py advances."""
+    state = SimpleNamespace(now=1000.0, sleeps=[])
+
+    async def sleep(seconds):
+        state.sleeps.append(seconds)
+        state.now += seconds
+
+    monkeypatch.setattr(resilience, 'time', SimpleNamespace(monotonic=lambda: state.now))
+    monkeypatch.setattr(resilience, 'asyncio', SimpleNamespace(sleep=sleep))
+    return state
+
+
+def test_token_bucket_allows_a_burst_then_the_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+
+    async def acquire(times):
+        for _ in range(times):
+            await bucket.acquire()
+
+    asyncio.run(acquire(3))
+    assert clock.sleeps == []
+    asyncio.run(acquire(2))
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+
+
+def test_token_bucket_refills_up_to_the_burst(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    asyncio.run(bucket.acquire())
+    clock.now += 60
+    asyncio.run(bucket.acquire())
+    asyncio.run(bucket.acquire())
+    assert clock.sleeps == []
+    asyncio.run(bucket.acquire())
+    assert clock.sleeps == [pytest.approx(1)]
+
+
+def test_is_retryable():
+    def http_error(status):
+        error = Exception()
+        error.response = SimpleNamespace(status_code=status)
+        return error
+
+    assert is_retryable(TimeoutError())
+    assert is_retryable(http_error(503))
+    assert is_retryable(http_error(429))
+    assert not is_retryable(http_error(404))
+    assert not is_retryable(ImportError())
+
+
+def test_circuit_opens_after_the_threshold(tmp_path):
+    path = str(tmp_path / 'circuit-state.json')
+    breaker = CircuitBreaker('wotc', path, threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure(now=0)
+        assert breaker.allow(now=0)
+    breaker.record_failure(now=0)
+    assert not breaker.allow(now=30)
+    assert breaker.allow(now=61)
+
+
+def test_failed_trial_reopens_with_a_longer_cooldown(tmp_path):
+    path = str(tmp_path / 'circuit-state.json')
+    breaker = CircuitBreaker('wotc', path, threshold=1, cooldown=60, max_cooldown=100)
+    breaker.record_failure(now=0)
+    assert breaker.allow(now=60)
+    breaker.record_failure(now=60)
+    assert not breaker.allow(now=159)
+    assert breaker.allow(now=160)
+    breaker.record_failure(now=160)
+    assert not breaker.allow(now=259)
+    assert breaker.state['cooldown'] == 100
+
+
+def test_success_resets_the_circuit(tmp_path):
+    path = str(tmp_path / 'circuit-state.json')
+    breaker = CircuitBreaker('wotc', path, threshold=1, cooldown=60)
+    breaker.record_failure(now=0)
+    breaker.record_success()
+    assert breaker.allow(now=1)
+    assert breaker.state == {'failures': 0, 'open_until': 0, 'cooldown': 60}
+
+
+def test_circuit_state_is_kept_per_source_between_runs(tmp_path):
+    path = str(tmp_path / 'circuit-state.json')
+    CircuitBreaker('wotc', path, threshold=1, cooldown=60).record_failure(now=0)
+    assert not CircuitBreaker('wotc', path, threshold=1, cooldown=60).allow(now=1)
+    assert CircuitBreaker('pokemon', path, threshold=1, cooldown=60).allow(now=1)
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['wotc']['failures'] == 1
+
+
+def test_unreadable_circuit_state_is_ignored(tmp_path):
+    path = tmp_path / 'circuit-state.json'
+    path.write_text('{')
+    assert CircuitBreaker('wotc', str(path)).allow()
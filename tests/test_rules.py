@@ -0,0 +1,120 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from eighthside.rules import CASUAL_PLAY_RULES, Rule, RuleMatcher, parse_rules
+
+
+def test_exclude_rule_rejects_and_counts_the_hit():
+    matcher = RuleMatcher(CASUAL_PLAY_RULES)
+    accepted, rule = matcher.check({'title': "Friday Night Magic - Casual Play"})
+    assert not accepted
+    assert rule.name == 'casual play'
+    assert matcher.hits == {'casual play': 1}
+    assert matcher.accepts({'title': "Modern Tournament"})
+
+
+def test_include_rules_reject_events_that_match_none():
+    matcher = RuleMatcher([Rule('8th side', '8th', field='text', action='include')])
+    assert matcher.accepts({'title': "League Challenge", 'store': "8th Side Games"})
+    assert not matcher.accepts({'title': "League Challenge", 'store': "Other Store"})
+    assert matcher.hits['(no include matched)'] == 1
+
+
+def test_keywords_are_literal_and_case_insensitive():
+    matcher = RuleMatcher([Rule('dollar', '$5')])
+    assert not matcher.accepts({'title': "ENTRY $5"})
+    assert matcher.accepts({'title': "Entry 5"})
+
+
+def test_combined_pattern_attributes_the_rule_that_fired():
+    matcher = RuleMatcher([Rule('one', 'alpha'), Rule('two', 'beta'), Rule('three', 'gamma', field='store')])
+    assert matcher.check({'title': "beta"})[1].name == 'two'
+    assert matcher.check({'title': "x", 'store': "Gamma"})[1].name == 'three'
+
+
+def test_duplicate_group_names_across_rules():
+    matcher = RuleMatcher([Rule('a', r'(?P<word>draft)', kind='regex'),
+                           Rule('b', r'(?P<word>sealed)', kind='regex')])
+    assert matcher.check({'title': "Sealed league"})[1].name == 'b'
+    assert matcher.check({'title': "Draft night"})[1].name == 'a'
+
+
+def test_numbered_backreference_refers_to_its_own_rule():
+    matcher = RuleMatcher([Rule('plain', 'casual play'), Rule('double', r'(\w)\1', kind='regex')])
+    assert matcher.check({'title': "Modern"})[0]
+    assert matcher.check({'title': "Booster draft"})[1].name == 'double'
+    assert matcher.check({'title': "Casual play"})[1].name == 'plain'
+
+
+def test_rules_with_global_flags_get_their_own_pattern():
+    matcher = RuleMatcher([Rule('plain', 'casual play'), Rule('verbose', r'(?x) pre - ?release', kind='regex')])
+    assert matcher.check({'title': "Prerelease"})[1].name == 'verbose'
+    assert matcher.check({'title': "casual play"})[1].name == 'plain'
+
+
+def test_invalid_pattern_raises_value_error():
+    with pytest.raises(ValueError, match="broken"):
+        RuleMatcher([Rule('broken', '(unclosed', kind='regex')])
+
+
+def test_parse_rules_defaults_the_name_to_the_pattern():
+    rules = parse_rules([{'pattern': 'casual play'}, {'name': 'x', 'pattern': 'y', 'action': 'include'}])
+    assert rules[0].name == 'casual play'
+    assert rules[1].action == 'include'
+    with pytest.raises(ValueError):
+        parse_rules([{'pattern': 'y', 'field': 'nowhere'}])
+    with pytest.raises(ValueError):
+        parse_rules([{'pattern': 'y', 'colour': 'red'}])
+
+
+@pytest.mark.parametrize('content', [
+    None,
+    '{"pattern": ',
+    '[{"pattern": "(unclosed", "kind": "regex"}]',
+    '[{"pattern": "y", "colour": "red"}]',
+])
+def test_bad_rules_files_are_usage_errors(tmp_path, capsys, content):
+    from eighthside.cli import main
+    path = tmp_path / 'rules.json'
+    if content is not None:
+        path.write_text(content)
+    with pytest.raises(SystemExit) as exit_info:
+        main(['wotc', '--rules', str(path)])
+    assert exit_info.value.code == 2
+    assert "bad rules file" in capsys.readouterr().err
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+def test_javascript_export_matches_python():
+    rules = [
+        Rule('store-x', 'other', field='store'),
+        Rule('title-y', 'draft'),
+        Rule('casual', 'casual play'),
+        Rule('late', 'play'),
+        Rule('a', r'(?P<word>sealed)', kind='regex'),
+        Rule('b', r'(?P<word>z)(?P=word)', kind='regex'),
+        Rule('flags', r'(?i)prerelease', kind='regex'),
+        Rule('8th side', '8th', field='text', action='include'),
+    ]
+    events = [
+        {'title': "Casual Play", 'store': "8th Side"},
+        {'title': "Play casual play", 'store': "8th Side"},
+        {'title': "Draft", 'store': "Other Store"},
+        {'title': "Sealed", 'store': "8th Side"},
+        {'title': "zz top", 'store': "8th Side"},
+        {'title': "Prerelease", 'store': "8th Side"},
+        {'title': "League", 'store': "8th Side"},
+        {'title': "League", 'store': "Elsewhere"},
+    ]
+    matcher = RuleMatcher(rules)
+    script = (f"const check = {matcher.to_javascript()};\n"
+              f"const hits = {{}};\n"
+              f"const accepted = {json.dumps(events)}.map(e => check(e, hits));\n"
+              f"console.log(JSON.stringify({{accepted, hits}}));\n")
+    result = json.loads(subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True).stdout)
+
+    assert result['accepted'] == [matcher.accepts(event) for event in events]
+    assert result['hits'] == dict(matcher.hits)
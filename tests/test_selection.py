@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from eighthside.selection import REPROBE_AFTER, BackendHistory, escalate
+
+NOW = 1_800_000_000
+
+
+def history(tmp_path):
+    return BackendHistory(str(tmp_path / 'backend-history.json'))
+
+
+def test_untried_backends_go_cheapest_first(tmp_path):
+    assert history(tmp_path).order('wotc', ['selenium', 'http', 'playwright']) == ['http', 'playwright', 'selenium']
+
+
+def test_poor_backends_move_to_the_back(tmp_path):
+    backends = history(tmp_path)
+    for _ in range(3):
+        backends.record('wotc', 'http', ok=True, empty=True, now=NOW)
+        backends.record('wotc', 'selenium', ok=False, now=NOW)
+    backends.record('wotc', 'selenium', ok=True, now=NOW)
+    backends.record('wotc', 'playwright', ok=True, now=NOW)
+    # selenium found events once, http never did
+    assert backends.order('wotc', ['http', 'playwright', 'selenium'], now=NOW) == ['playwright', 'selenium', 'http']
+
+
+def test_poor_backend_is_retried_after_reprobe_period(tmp_path):
+    backends = history(tmp_path)
+    backends.record('wotc', 'http', ok=False, now=NOW)
+    assert backends.order('wotc', ['http', 'playwright'], now=NOW + 60) == ['playwright', 'http']
+    assert backends.order('wotc', ['http', 'playwright'], now=NOW + REPROBE_AFTER) == ['http', 'playwright']
+
+
+def test_history_is_per_source_windowed_and_saved(tmp_path):
+    backends = BackendHistory(str(tmp_path / 'h.json'), window=3)
+    for i in range(5):
+        backends.record('wotc', 'http', ok=True, size=i, now=NOW + i)
+    backends.save()
+    reloaded = BackendHistory(str(tmp_path / 'h.json'), window=3)
+    assert [a['bytes'] for a in reloaded.attempts['wotc']['http']] == [2, 3, 4]
+    assert reloaded.stats('pokemon', 'http') is None
+
+
+def run(source='wotc'):
+    return SimpleNamespace(source=source, debug=False, backend=None)
+
+
+def test_escalate_stops_at_the_first_backend_with_events(tmp_path):
+    backends = history(tmp_path)
+    tried = []
+
+    async def attempt(name):
+        tried.append(name)
+        if name == 'http':
+            raise ConnectionError("refused")
+        if name == 'playwright':
+            return [], 10, True
+        return ['event'], 100, False
+
+    current = run()
+    result = asyncio.run(escalate(current, backends, ['http', 'playwright', 'selenium', 'other'], attempt))
+    assert result == ['event']
+    assert tried == ['http', 'playwright', 'selenium']
+    assert current.backend == 'selenium'
+    saved = BackendHistory(backends.path).attempts['wotc']
+    assert [a['ok'] for a in saved['http']] == [False]
+    assert [a['empty'] for a in saved['playwright']] == [True]
+
+
+def test_escalate_returns_the_empty_result_when_nothing_finds_events(tmp_path):
+    async def attempt(name):
+        if name == 'http':
+            return [], 5, True
+        raise TimeoutError("slow")
+
+    assert asyncio.run(escalate(run(), history(tmp_path), ['http', 'playwright'], attempt)) == []
+
+
+def test_escalate_raises_when_every_backend_fails(tmp_path):
+    async def attempt(name):
+        raise TimeoutError(name)
+
+    backends = history(tmp_path)
+    with pytest.raises(TimeoutError, match="playwright"):
+        asyncio.run(escalate(run(), backends, ['http', 'playwright'], attempt))
+    assert set(BackendHistory(backends.path).attempts['wotc']) == {'http', 'playwright'}
@@ -0,0 +1,71 @@
+from eighthside.selectorstats import NEVER_MATCHED_RUNS, REPROBE_EVERY, SelectorStats
+
+TITLE = ['.row.no-gutters', '.event-title', '.event-name', 'h4', 'h5']
+
+
+def run(stats, usage):
+    stats.record('wotc', {'title': usage})
+
+
+def test_without_stats_the_adapter_order_is_kept(tmp_path):
+    stats = SelectorStats(str(tmp_path / 'stats.json'))
+    assert stats.order('wotc', 'title', TITLE) == TITLE
+
+
+def test_loose_fallback_winning_one_run_does_not_take_over(tmp_path):
+    stats = SelectorStats(str(tmp_path / 'stats.json'))
+    run(stats, {'.row.no-gutters': [5, 0]})
+    # One drifted page: the preferred selector misses and h4 wins
+    run(stats, {'.row.no-gutters': [0, 5], '.event-title': [0, 5], '.event-name': [0, 5], 'h4': [5, 0]})
+    assert stats.sources['wotc']['title']['winner'] == 'h4'
+    assert stats.order('wotc', 'title', TITLE) == TITLE
+
+
+def test_never_matched_candidates_ahead_of_the_winner_go_last(tmp_path):
+    stats = SelectorStats(str(tmp_path / 'stats.json'))
+    for _ in range(NEVER_MATCHED_RUNS):
+        run(stats, {'.row.no-gutters': [0, 4], '.event-title': [0, 4], '.event-name': [4, 0]})
+    assert stats.order('wotc', 'title', TITLE) == ['.event-name', 'h4', 'h5', '.row.no-gutters', '.event-title']
+
+
+def test_candidates_are_only_skipped_after_enough_runs(tmp_path):
+    stats = SelectorStats(str(tmp_path / 'stats.json'))
+    for _ in range(NEVER_MATCHED_RUNS - 1):
+        run(stats, {'.row.no-gutters': [0, 4], '.event-title': [4, 0]})
+    assert stats.order('wotc', 'title', TITLE) == TITLE
+
+
+def test_full_chain_is_reprobed_periodically(tmp_path):
+    stats = SelectorStats(str(tmp_path / 'stats.json'))
+    skipped = ['.event-title', '.event-name', 'h4', 'h5', '.row.no-gutters']
+    orders = []
+    for _ in range(REPROBE_EVERY + 1):
+        run(stats, {'.row.no-gutters': [0, 4], '.event-title': [4, 0]})
+        orders.append(stats.order('wotc', 'title', TITLE))
+    # orders[i] follows run i + 1; one run in REPROBE_EVERY gets the adapter's order
+    reprobed = [i for i, order in enumerate(orders) if order == TITLE and i >= NEVER_MATCHED_RUNS - 1]
+    assert reprobed == [REPROBE_EVERY - 2]
+    assert orders[NEVER_MATCHED_RUNS - 1] == orders[-1] == skipped
+
+
+def test_preferred_selector_matching_again_takes_back_over(tmp_path):
+    stats = SelectorStats(str(tmp_path / 'stats.json'))
+    for _ in range(NEVER_MATCHED_RUNS):
+        run(stats, {'.row.no-gutters': [0, 4], '.event-title': [4, 0]})
+    run(stats, {'.row.no-gutters': [4, 0]})
+    assert stats.order('wotc', 'title', TITLE) == TITLE
+
+
+def test_drift_is_logged(tmp_path, caplog):
+    stats = SelectorStats(str(tmp_path / 'stats.json'))
+    run(stats, {'.row.no-gutters': [4, 0]})
+    run(stats, {'.row.no-gutters': [0, 4], '.event-title': [4, 0]})
+    assert "'.row.no-gutters' matched 0 of 4 lookups, '.event-title' took over" in caplog.text
+
+
+def test_stats_are_saved_and_reloaded(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    stats = SelectorStats(path)
+    run(stats, {'.event-title': [4, 0]})
+    stats.save()
+    assert SelectorStats(path).sources == stats.sources
@@ -0,0 +1,133 @@
+import asyncio
+import gzip
+
+import pytest
+
+from eighthside.server import FeedStore, build_response, make_handler
+
+FEED = b'<?xml version="1.0"?><rss><channel><title>8th Side</title></channel></rss>'
+
+
+@pytest.fixture
+def store():
+    store = FeedStore()
+    store.publish('/feed.rss', FEED, mtime=1_700_000_000)
+    return store
+
+
+def exchange(store, raw):
+    """Send raw request bytes to the handler; return everything it writes back."""
+    async def run():
+        server = await asyncio.start_server(make_handler(store), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(raw)
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return response
+    return asyncio.run(run())
+
+
+def parse(response):
+    head, _, body = response.partition(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+def test_get_returns_the_feed_with_validators(store):
+    status, headers, body = build_response(store, 'GET', '/feed.rss', {})
+    assert status == 200
+    assert body == FEED
+    assert headers['Content-Type'] == 'application/rss+xml; charset=utf-8'
+    assert headers['ETag'] == store.get('/feed.rss').etag
+    assert headers['Last-Modified'] == 'Tue, 14 Nov 2023 22:13:20 GMT'
+
+
+def test_gzip_is_served_when_accepted(store):
+    status, headers, body = build_response(store, 'GET', '/feed.rss', {'accept-encoding': 'br, gzip'})
+    assert headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == FEED
+    assert headers['ETag'] == store.get('/feed.rss').gzip_etag
+    _, headers, body = build_response(store, 'GET', '/feed.rss', {'accept-encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in headers
+    assert body == FEED
+
+
+def test_conditional_requests_get_304(store):
+    etag = store.get('/feed.rss').etag
+    assert build_response(store, 'GET', '/feed.rss', {'if-none-match': f'W/"x", {etag}'})[0] == 304
+    assert build_response(store, 'GET', '/feed.rss', {'if-none-match': '"stale"'})[0] == 200
+    since = 'Tue, 14 Nov 2023 22:13:20 GMT'
+    assert build_response(store, 'GET', '/feed.rss', {'if-modified-since': since})[0] == 304
+    assert build_response(store, 'GET', '/feed.rss', {'if-modified-since': 'Mon, 13 Nov 2023 00:00:00 GMT'})[0] == 200
+    # The gzip variant has its own ETag, so a plain ETag does not validate it
+    headers = {'if-none-match': etag, 'accept-encoding': 'gzip'}
+    assert build_response(store, 'GET', '/feed.rss', headers)[0] == 200
+
+
+def test_unknown_paths_and_methods(store):
+    assert build_response(store, 'GET', '/missing.rss', {})[0] == 404
+    status, headers, _ = build_response(store, 'POST', '/feed.rss', {})
+    assert status == 405
+    assert headers['Allow'] == 'GET, HEAD'
+
+
+def test_publish_reports_changes(store):
+    assert not store.publish('/feed.rss', FEED)
+    assert store.publish('/feed.rss', FEED + b'\n', mtime=1)
+    assert store.get('/feed.rss').data == FEED + b'\n'
+
+
+def test_head_sends_headers_only(store):
+    status, headers, body = parse(exchange(store, b'HEAD /feed.rss HTTP/1.0\r\n\r\n'))
+    assert status == 200
+    assert headers['Content-Length'] == str(len(FEED))
+    assert body == b''
+
+
+def test_keep_alive_serves_several_requests(store):
+    etag = store.get('/feed.rss').etag.encode()
+    response = exchange(store, b'GET /feed.rss?x=1 HTTP/1.1\r\nHost: x\r\n\r\n'
+                               b'GET /feed.rss HTTP/1.1\r\nIf-None-Match: ' + etag + b'\r\nConnection: close\r\n\r\n')
+    assert response.count(b'HTTP/1.1 200 OK') == 1
+    assert response.count(b'HTTP/1.1 304 Not Modified') == 1
+    assert response.endswith(b'\r\n\r\n')
+
+
+def test_malformed_request_line_gets_400(store):
+    status, headers, _ = parse(exchange(store, b'GARBAGE\r\n\r\n'))
+    assert status == 400
+    assert headers['Connection'] == 'close'
+
+
+def test_watched_file_is_reloaded_when_rewritten(tmp_path):
+    path = tmp_path / 'feed.rss'
+    path.write_bytes(FEED)
+    store = FeedStore()
+    url_path = store.watch(str(path), '/feed.rss')
+    assert store.get(url_path).data == FEED
+    path.write_bytes(b'')
+    assert not store.reload(url_path)
+    assert store.get(url_path).data == FEED
+    path.write_bytes(FEED + b'<!-- new -->')
+    assert store.reload(url_path)
+    assert store.get(url_path).data.endswith(b'<!-- new -->')
+
+
+def test_oversized_header_line_gets_400(store):
+    status, headers, _ = parse(exchange(store, b'GET /feed.rss HTTP/1.1\r\nX-Junk: ' + b'a' * 70000 + b'\r\n\r\n'))
+    assert status == 400
+    assert headers['Connection'] == 'close'
+
+
+def test_requests_with_a_body_close_the_connection(store):
+    # The body is never read, so it must not be taken for the next request
+    response = exchange(store, b'POST /feed.rss HTTP/1.1\r\nContent-Length: 27\r\n\r\n'
+                               b'GET /feed.rss HTTP/1.1\r\n\r\n')
+    status, headers, _ = parse(response)
+    assert status == 405
+    assert headers['Connection'] == 'close'
+    assert response.count(b'HTTP/1.1') == 1
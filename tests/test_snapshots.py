@@ -0,0 +1,88 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from eighthside import snapshots
+from eighthside.snapshots import SnapshotArchive
+
+
+def archive_run(root, run):
+    archive = SnapshotArchive(str(root))
+    archive.run = run
+    return archive
+
+
+def objects(root):
+    return sorted(name for _, _, names in os.walk(root / 'objects') for name in names)
+
+
+def test_payloads_are_stored_once_and_load_back(tmp_path):
+    archive = archive_run(tmp_path, 'run1')
+    first = archive.store('wotc', '<html>events</html>')
+    again = archive.store('wotc', b'<html>events</html>')
+    assert first == again
+    assert len(objects(tmp_path)) == 1
+    assert len(archive.entries()) == 2
+    assert archive.load(first) == b'<html>events</html>'
+    with pytest.raises(KeyError):
+        archive.load('0' * 64)
+
+
+def test_entries_filter_by_source(tmp_path):
+    archive = archive_run(tmp_path, 'run1')
+    archive.store('wotc', 'a')
+    archive.store('pokemon', '{}', 'json')
+    assert [e['source'] for e in archive.entries('pokemon')] == ['pokemon']
+    assert archive.entries('pokemon')[0]['kind'] == 'json'
+
+
+def test_resolve_latest_run_id_and_hash_prefix(tmp_path):
+    archive_run(tmp_path, 'run1').store('wotc', 'old page')
+    archive = archive_run(tmp_path, 'run2')
+    api = archive.store('pokemon', '{"page": 1}', 'json')
+    page = archive.store('wotc', 'new page')
+    archive.store('wotc', 'new page, part two')
+
+    assert [e['hash'] for e in archive.resolve('latest', 'pokemon')] == [api]
+    assert len(archive.resolve('latest', 'wotc')) == 2
+    assert {e['run'] for e in archive.resolve('run1')} == {'run1'}
+    assert [e['hash'] for e in archive.resolve(page[:12])] == [page]
+    assert archive.resolve('latest', 'nothing') == []
+
+
+def test_ambiguous_hash_prefix_is_an_error(tmp_path):
+    archive = archive_run(tmp_path, 'run1')
+    digests = [archive.store('wotc', str(i)) for i in range(40)]
+    prefix = next(a[:1] for a in digests if sum(d.startswith(a[:1]) for d in digests) > 1)
+    with pytest.raises(ValueError, match="ambiguous"):
+        archive.resolve(prefix)
+
+
+def test_prune_keeps_recent_entries_and_runs(tmp_path, monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(snapshots, 'time', SimpleNamespace(time=lambda: now - 365 * 86400))
+    old = archive_run(tmp_path, 'run1')
+    kept_by_run = old.store('wotc', 'last wotc page')
+    dropped = old.store('pokemon', 'old pokemon page')
+    monkeypatch.setattr(snapshots, 'time', SimpleNamespace(time=lambda: now))
+    archive = archive_run(tmp_path, 'run2')
+    fresh = archive.store('pokemon', 'new pokemon page')
+
+    # The old wotc page is a year old but still the last wotc run
+    assert archive.prune(keep_days=30, keep_runs=1) == 1
+    assert {e['hash'] for e in archive.entries()} == {kept_by_run, fresh}
+    assert archive.load(kept_by_run) == b'last wotc page'
+    with pytest.raises(KeyError):
+        archive.load(dropped)
+
+
+def test_prune_without_keep_runs_drops_everything_old(tmp_path, monkeypatch):
+    now = time.time()
+    monkeypatch.setattr(snapshots, 'time', SimpleNamespace(time=lambda: now - 40 * 86400))
+    archive_run(tmp_path, 'run1').store('wotc', 'page')
+    monkeypatch.setattr(snapshots, 'time', SimpleNamespace(time=lambda: now))
+    archive = archive_run(tmp_path, 'run2')
+    assert archive.prune(keep_days=30) == 1
+    assert archive.entries() == []